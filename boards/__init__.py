@@ -12,10 +12,27 @@ class Board:
     input_clk_name: str = ""
     input_clk_freq: float = 0.0
 
+    # Logic budget (override per board), 0 if unknown
+    lut_count: int = 0
+    ff_count: int = 0
+
+    # On-chip block RAM (override per board), used for memory budgeting
+    bsram_blocks: int = 0
+    bsram_block_size: int = 2 * 1024  # Bytes per block in x16/x32 modes
+
     def create_platform(self):
         """Create and return platform instance"""
         raise NotImplementedError
 
+    def extra_clocks(self, config):
+        """
+        Return clock domains the board's peripherals need for config.
+
+        Merged into config.clocks before the clock generator is created, as a
+        dict of name -> ClockSpec.
+        """
+        return {}
+
     def add_main_memory(self, soc, platform, config):
         """
         Add board-specific main memory (external RAM) to SoC.
@@ -34,6 +51,15 @@ class Board:
         """
         raise NotImplementedError
 
+    def build_kwargs(self, soc, config):
+        """
+        Return extra keyword arguments for the LiteX Builder's build().
+
+        Used by boards whose toolchain needs more than the platform, e.g. the
+        simulator's SimConfig.
+        """
+        return {}
+
 
 _boards: Dict[str, Type[Board]] = {}
 
@@ -57,3 +83,4 @@ def get_board(name: str) -> Board:
 
 # Import all boards to trigger registration
 from .tang_nano_9k import TangNano9K  # noqa: E402,F401
+from .sim import Sim  # noqa: E402,F401
@@ -0,0 +1,57 @@
+"""Simulation Board Support"""
+
+from boards import Board, register_board
+from .platform import SimBoardPlatform
+
+from litex.build.sim.config import SimConfig
+from litex.soc.integration.common import get_mem_data
+from litex.soc.interconnect import wishbone
+from soc.memory import add_main_ram
+
+
+@register_board("sim")
+class Sim(Board):
+    """
+    Verilator Simulation.
+
+    Runs the SoC (e.g. a multi-hart VexRiscv SMP configuration too large for
+    the Tang Nano 9K) with the console on the terminal. Main RAM is an SRAM
+    behind the same multi-port front end as the HyperRAM, so the memory path
+    seen by the CPU matches the hardware apart from latency.
+
+    Use --uart-name sim; --sim-ram-init preloads main RAM and boots it.
+    """
+
+    name = "Simulation"
+
+    # Clock configuration: the simulator runs sys_clk at sys_clk_freq
+    input_clk_name = "sys_clk"
+
+    # Platform ----------------------------------------------------------------
+    def create_platform(self):
+        """Create platform instance."""
+        return SimBoardPlatform()
+
+    # Main memory (SRAM model) -----------------------------------------------
+    def add_main_memory(self, soc, platform, config):
+        """Add an SRAM of external_ram_size as main RAM."""
+        init = []
+        if config.sim_ram_init:
+            init = get_mem_data(config.sim_ram_init, data_width=32, endianness="little")
+            soc.add_constant("ROM_BOOT_ADDRESS", soc.mem_map["main_ram"])
+
+        soc.main_ram_model = wishbone.SRAM(config.external_ram_size, init=init)
+        add_main_ram(soc, config, soc.main_ram_model.bus)
+
+    # Board-specific peripherals ---------------------------------------------
+    def add_peripherals(self, soc, platform, config):
+        """The simulation has no peripherals beyond the console."""
+
+    # Simulator configuration ------------------------------------------------
+    def build_kwargs(self, soc, config):
+        """Clock the simulation at sys_clk_freq and attach the console."""
+        sim_config = SimConfig()
+        sim_config.add_clocker("sys_clk", freq_hz=int(config.sys_clk_freq))
+        if config.uart_name == "sim":
+            sim_config.add_module("serial2console", "serial")
+        return {"sim_config": sim_config, "run": True}
@@ -0,0 +1,32 @@
+"""Simulation Platform Definition"""
+
+from litex.build.generic_platform import Pins, Subsignal
+from litex.build.sim import SimPlatform
+
+# IO Definitions
+
+_io = [
+    # Clock / Reset (driven by the simulator)
+    ("sys_clk", 0, Pins(1)),
+    ("sys_rst", 0, Pins(1)),
+
+    # Console (serial2console module)
+    ("serial", 0,
+        Subsignal("source_valid", Pins(1)),
+        Subsignal("source_ready", Pins(1)),
+        Subsignal("source_data",  Pins(8)),
+
+        Subsignal("sink_valid",   Pins(1)),
+        Subsignal("sink_ready",   Pins(1)),
+        Subsignal("sink_data",    Pins(8)),
+    ),
+]
+
+
+class SimBoardPlatform(SimPlatform):
+    """Verilator platform."""
+
+    default_clk_name = "sys_clk"
+
+    def __init__(self):
+        SimPlatform.__init__(self, "SIM", _io, toolchain="verilator")
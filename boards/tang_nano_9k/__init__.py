@@ -5,9 +5,12 @@ from migen import Signal
 from boards import Board, register_board
 from .platform import TangNano9KPlatform
 from .peripherals import add_peripherals as nano_add_peripherals
+from .peripherals import video_framebuffer_size
 
-from litex.soc.integration.soc import SoCRegion
+from litex.soc.cores.video import video_timings
 from cores.hyperbus import create_hyperram_controller
+from soc.config import ClockSpec
+from soc.memory import add_main_ram
 
 
 @register_board("tang_nano_9k")
@@ -29,11 +32,32 @@ class TangNano9K(Board):
     input_clk_name = "clk27"
     input_clk_freq = 27e6
 
+    # Logic budget
+    lut_count = 8640
+    ff_count  = 6480
+
+    # 26 x 18 Kbit BSRAM blocks (16 Kbit usable without parity)
+    bsram_blocks = 26
+
     # Platform ----------------------------------------------------------------
     def create_platform(self):
         """Create platform instance."""
         return TangNano9KPlatform()
 
+    # Clocks -------------------------------------------------------------------
+    def extra_clocks(self, config):
+        """
+        HDMI needs a pixel clock and a 5x serializer clock (CLKDIV derives
+        the pixel clock from the 5x one).
+        """
+        if not getattr(config, "want_video", False):
+            return {}
+        pix_clk = video_timings[config.video_timings]["pix_clk"]
+        return {
+            "hdmi5x": ClockSpec(5 * pix_clk),
+            "hdmi":   ClockSpec(pix_clk),
+        }
+
     # Main memory (HyperRAM via HyperBus) ------------------------------------
     def add_main_memory(self, soc, platform, config):
         """
@@ -54,21 +78,10 @@ class TangNano9K(Board):
                 pads._ck_n.eq(~pads.clk),
             ]
 
-        # Create HyperRAM controller and map as main RAM.
-        hyperram = create_hyperram_controller(pads)
-        soc.hyperram = hyperram
-
-        soc.bus.add_slave(
-            name="main_ram",
-            slave=hyperram.bus,
-            region=SoCRegion(
-                origin=soc.mem_map["main_ram"],
-                size=getattr(config, "external_ram_size", 4 * 1024 * 1024),
-            ),
-        )
-
-        # Skip memory test during boot (faster)
-        soc.add_constant("CONFIG_MAIN_RAM_INIT")
+        # Create HyperRAM controller and map it as main RAM behind the
+        # multi-port front end, keeping the framebuffer out of main_ram.
+        soc.hyperram = create_hyperram_controller(pads)
+        add_main_ram(soc, config, soc.hyperram.bus, reserved=video_framebuffer_size(config))
 
     # HyperBus helper --------------------------------------------------------
     def get_hyperram_pads(self, platform):
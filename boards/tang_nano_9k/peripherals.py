@@ -1,9 +1,17 @@
 """Tang Nano 9K Peripheral Configuration"""
 
+from migen import ClockDomainsRenamer
+
 from litex.soc.cores.timer import Timer
 from litex.soc.cores.gpio import GPIOOut, GPIOIn, GPIOTristate
 from litex.soc.cores.spi import SPIMaster
 from litex.soc.cores.bitbang import I2CMaster
+from litex.soc.cores.video import video_timings, VideoTimingGenerator, VideoGowinHDMIPHY
+from litex.soc.integration.soc import SoCRegion
+
+from cores.uart import DMAUART
+from cores.video import LineBufferedScanout
+from cores.video.scanout import FORMAT_DEPTH
 
 
 def add_peripherals(soc, platform, config):
@@ -36,10 +44,26 @@ def add_peripherals(soc, platform, config):
     if getattr(config, "want_i2c", False):
         soc.i2c0 = I2CMaster(pads=platform.request("i2c0"))
 
-    # Secondary UART (expansion header)
+    # Secondary UART (expansion header by default, "serial" for the FT2232)
     if getattr(config, "want_uart", False):
-        # Expose expansion UART as "uart1"
-        soc.add_uart(name="uart1", uart_name="uart0")
+        pads_name = getattr(config, "uart1_pads", "uart0")
+        if getattr(config, "uart1_with_dma", False):
+            soc.uart1 = DMAUART(
+                pads=platform.request(pads_name),
+                clk_freq=config.sys_clk_freq,
+                baudrate=config.uart1_baudrate,
+                fifo_depth=config.uart1_dma_fifo_depth,
+            )
+            soc.bus.add_master(name="uart1", master=soc.uart1.bus)
+            soc.irq.add("uart1", use_loc_if_exists=True)
+        else:
+            # Expose expansion UART as "uart1"
+            soc.add_uart(
+                name="uart1",
+                uart_name=pads_name,
+                baudrate=getattr(config, "uart1_baudrate", 115200),
+                fifo_depth=getattr(config, "uart1_fifo_depth", 16),
+            )
 
     # SPI (SDCard on J6)
     if getattr(config, "want_spi", False):
@@ -61,8 +85,76 @@ def add_peripherals(soc, platform, config):
         # For now, just expose pins as GPIOOut.
         soc.pwm0 = GPIOOut(pads=platform.request("pwm0"))
         soc.pwm1 = GPIOOut(pads=platform.request("pwm1"))
+
+    # HDMI framebuffer (framebuffer lives at the top of main RAM)
+    if getattr(config, "want_video", False):
+        if "main_ram" not in soc.bus.regions:
+            print("Video: no main RAM for the framebuffer, HDMI not added")
+        else:
+            add_video(soc, platform, config)
     
     # SPID Card
     #if getattr(config, "want_spi", False):
     #    soc.add_spi_flash(mode="1x", module=W25Q32(Codes.READ_1_1_1), with_master=False)
     #    soc.add_spi_sdcard()
+
+
+def video_framebuffer_size(config):
+    """Framebuffer bytes for config (0 without video)."""
+    if not getattr(config, "want_video", False):
+        return 0
+    timings = video_timings[config.video_timings]
+    scale   = config.video_scale
+    return (timings["h_active"] // scale) * (timings["v_active"] // scale) * \
+        FORMAT_DEPTH[config.video_format] // 8
+
+
+def add_video(soc, platform, config):
+    """
+    Add HDMI output scanning out a framebuffer from external RAM.
+
+    Uses the hdmi/hdmi5x clock domains requested by TangNano9K.extra_clocks().
+    The framebuffer sits right after the main_ram region, in the space
+    add_main_memory() reserved for it, and is exported as the
+    video_framebuffer linker region. Scanout is enabled at reset and shows
+    whatever the RAM holds until firmware draws.
+    """
+    timings = video_timings[config.video_timings]
+    hres    = timings["h_active"]
+    vres    = timings["v_active"]
+    scale   = config.video_scale
+    fb_size = video_framebuffer_size(config)
+
+    main_ram = soc.bus.regions["main_ram"]
+    fb_base  = main_ram.origin + main_ram.size
+    assert fb_base + fb_size <= main_ram.origin + main_ram.size_pow2, "framebuffer not reserved"
+    soc.bus.add_region("video_framebuffer", SoCRegion(origin=fb_base, size=fb_size, linker=True))
+
+    soc.videophy = VideoGowinHDMIPHY(platform.request("hdmi"), clock_domain="hdmi")
+    soc.video_vtg = ClockDomainsRenamer("hdmi")(
+        VideoTimingGenerator(default_video_timings=config.video_timings)
+    )
+    soc.video_scanout = LineBufferedScanout(
+        hres=hres,
+        vres=vres,
+        scale=scale,
+        format=config.video_format,
+        base=fb_base,
+        clock_domain="hdmi",
+    )
+    # Scanout has its own high-priority HyperRAM port where available, so
+    # CPU/DMA traffic on the SoC bus cannot starve it.
+    if hasattr(soc, "hyperram_frontend"):
+        port = soc.hyperram_frontend.get_port("video", priority=8)
+        soc.comb += soc.video_scanout.bus.connect(port)
+    else:
+        soc.bus.add_master(name="video", master=soc.video_scanout.bus)
+    soc.comb += [
+        soc.video_vtg.source.connect(soc.video_scanout.vtg_sink),
+        soc.video_scanout.source.connect(soc.videophy.sink),
+    ]
+
+    soc.add_constant("VIDEO_FRAMEBUFFER_BASE",  fb_base)
+    soc.add_constant("VIDEO_FRAMEBUFFER_HRES",  hres // scale)
+    soc.add_constant("VIDEO_FRAMEBUFFER_VRES",  vres // scale)
+    soc.add_constant("VIDEO_FRAMEBUFFER_DEPTH", FORMAT_DEPTH[config.video_format])
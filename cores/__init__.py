@@ -1,5 +1,14 @@
 """Hardware IP Cores"""
 
-from .hyperbus import create_hyperram_controller
+from .hyperbus import create_hyperram_controller, HyperRAMFrontend
+from .bist import MemoryBIST
+from .dma import DMAEngine
+from .profiler import PCSampler, FetchAddressTap
+from .timer import CycleTimer
+from .uart import DMAUART, BufferedUARTBone, BusCRC32
+from .video import LineBufferedScanout
 
-__all__ = ["create_hyperram_controller"]
+__all__ = ["create_hyperram_controller", "HyperRAMFrontend", "DMAEngine", "DMAUART",
+           "BufferedUARTBone", "BusCRC32", "LineBufferedScanout", "PCSampler", "FetchAddressTap",
+           "CycleTimer",
+           "MemoryBIST"]
@@ -0,0 +1,5 @@
+"""Memory Built-In Self-Test Core"""
+
+from .memtest import MemoryBIST
+
+__all__ = ["MemoryBIST"]
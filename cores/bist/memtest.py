@@ -0,0 +1,238 @@
+"""
+Memory Built-In Self-Test
+
+Wishbone bus master that fills a memory region with a test pattern and
+verifies it, reporting errors and bandwidth through CSRs.
+"""
+
+from migen import Signal, Constant, If, Mux, Cat
+from migen.genlib.fsm import FSM, NextState, NextValue
+
+from litex.gen import LiteXModule
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.csr import CSRStorage, CSRStatus, CSRField
+from litex.soc.interconnect.csr_eventmanager import EventManager, EventSourcePulse
+
+# Test patterns.
+PATTERN_WALKING = 0  # 1 << (word index % 32)
+PATTERN_ADDRESS = 1  # Byte address of the word.
+PATTERN_PRBS    = 2  # PRBS32 sequence from seed.
+PATTERN_ALL     = 3  # Walking, address, then PRBS.
+
+# PRBS32 (x^32 + x^22 + x^2 + x + 1), Galois form.
+PRBS32_TAPS = 0x80200003
+
+# Wishbone cycle type identifiers.
+CTI_INCREMENTING = 0b010
+CTI_END          = 0b111
+
+
+class MemoryBIST(LiteXModule):
+    """
+    Memory Built-In Self-Test.
+
+    Each pattern is one write pass over [base, base + length) followed by
+    one verify pass, in incrementing bursts of burst_length words. invert
+    complements the data (walking zeros etc.).
+
+    Results: errors counts mismatching words (bus errors included),
+    first_error_addr/expected/actual describe the first one, write_cycles
+    and read_cycles time the passes (bandwidth = 4 * words / cycles *
+    sys_clk_freq), passed is set when a test completes without errors.
+
+    The test is started from software; the bus is released between bursts,
+    so other masters are only slowed down (and must keep out of the region
+    under test).
+    """
+
+    def __init__(self, base, size, burst_length=16, pattern=PATTERN_ALL):
+        """
+        Initialize BIST.
+
+        Args:
+            base: Default region byte address.
+            size: Default region length in bytes.
+            burst_length: Words per bus burst.
+            pattern: Default pattern (PATTERN_*).
+        """
+        self.bus  = bus = wishbone.Interface(data_width=32)
+        self.busy = Signal()
+
+        # CSRs.
+        self.base = CSRStorage(32, reset=base, description="Region byte address.")
+        self.length = CSRStorage(32, reset=size, description="Region length in bytes.")
+        self.seed = CSRStorage(32, reset=1, description="PRBS seed (non-zero).")
+        self.control = CSRStorage(fields=[
+            CSRField("start", size=1, offset=0, pulse=True, description="Start test."),
+            CSRField("pattern", size=2, offset=1, reset=pattern, values=[
+                ("``0b00``", "Walking ones."),
+                ("``0b01``", "Address in address."),
+                ("``0b10``", "PRBS32."),
+                ("``0b11``", "All of the above."),
+            ]),
+            CSRField("invert", size=1, offset=3, description="Complement the pattern data."),
+        ])
+        self.status = CSRStatus(fields=[
+            CSRField("busy", size=1, offset=0, description="Test in progress."),
+            CSRField("done", size=1, offset=1, description="A test has completed."),
+            CSRField("passed", size=1, offset=2, description="The last test found no errors."),
+        ])
+        self.errors = CSRStatus(32, description="Mismatching words.")
+        self.first_error_addr = CSRStatus(32, description="Byte address of the first mismatch.")
+        self.first_error_expected = CSRStatus(32, description="Expected data of the first mismatch.")
+        self.first_error_actual = CSRStatus(32, description="Read data of the first mismatch.")
+        self.write_cycles = CSRStatus(32, description="sys_clk cycles spent writing.")
+        self.read_cycles = CSRStatus(32, description="sys_clk cycles spent verifying.")
+
+        self.ev = EventManager()
+        self.ev.done = EventSourcePulse(description="Test complete.")
+        self.ev.finalize()
+
+        # Pattern generator.
+        pattern   = Signal(2)
+        data      = Signal(32)
+        walking   = Signal(32)
+        prbs      = Signal(32)
+        adr       = Signal(30)
+        gen_reset = Signal()
+        gen_step  = Signal()
+        self.comb += data.eq(
+            Mux(pattern == PATTERN_WALKING, walking,
+            Mux(pattern == PATTERN_ADDRESS, Cat(Constant(0, 2), adr),
+                prbs)) ^ Mux(self.control.fields.invert, 0xffffffff, 0)
+        )
+        self.sync += [
+            If(gen_reset,
+                walking.eq(1),
+                prbs.eq(self.seed.storage)
+            ).Elif(gen_step,
+                walking.eq(Cat(walking[31], walking[:31])),
+                prbs.eq(Mux(prbs[0], (prbs >> 1) ^ PRBS32_TAPS, prbs >> 1))
+            )
+        ]
+
+        # Pass bookkeeping.
+        done      = Signal()
+        passed    = Signal()
+        remaining = Signal(30)
+        index     = Signal(max=burst_length)
+        last      = Signal()
+        all_mode  = Signal()
+        self.comb += last.eq((index == burst_length - 1) | (remaining == 1))
+
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(self.control.fields.start,
+                NextValue(done, 0),
+                NextValue(passed, 0),
+                NextValue(all_mode, self.control.fields.pattern == PATTERN_ALL),
+                NextValue(pattern, Mux(self.control.fields.pattern == PATTERN_ALL,
+                    PATTERN_WALKING, self.control.fields.pattern)),
+                NextValue(self.errors.status, 0),
+                NextValue(self.write_cycles.status, 0),
+                NextValue(self.read_cycles.status, 0),
+                NextState("WRITE-INIT")
+            )
+        )
+        fsm.act("WRITE-INIT",
+            self.busy.eq(1),
+            gen_reset.eq(1),
+            NextValue(adr, self.base.storage[2:]),
+            NextValue(remaining, self.length.storage[2:]),
+            NextValue(index, 0),
+            If(self.length.storage[2:] == 0,
+                NextState("DONE")
+            ).Else(
+                NextState("WRITE")
+            )
+        )
+        fsm.act("WRITE",
+            self.busy.eq(1),
+            NextValue(self.write_cycles.status, self.write_cycles.status + 1),
+            bus.cyc.eq(1),
+            bus.stb.eq(1),
+            bus.we.eq(1),
+            bus.adr.eq(adr),
+            bus.dat_w.eq(data),
+            bus.sel.eq(0xf),
+            bus.cti.eq(Mux(last, CTI_END, CTI_INCREMENTING)),
+            If(bus.ack | bus.err,
+                gen_step.eq(1),
+                NextValue(adr, adr + 1),
+                NextValue(remaining, remaining - 1),
+                NextValue(index, Mux(last, 0, index + 1)),
+                If(remaining == 1,
+                    NextState("READ-INIT")
+                ).Elif(last,
+                    NextState("WRITE-GAP")
+                )
+            )
+        )
+        # Release the bus between bursts.
+        fsm.act("WRITE-GAP",
+            self.busy.eq(1),
+            NextValue(self.write_cycles.status, self.write_cycles.status + 1),
+            NextState("WRITE")
+        )
+        fsm.act("READ-INIT",
+            self.busy.eq(1),
+            gen_reset.eq(1),
+            NextValue(adr, self.base.storage[2:]),
+            NextValue(remaining, self.length.storage[2:]),
+            NextValue(index, 0),
+            NextState("READ")
+        )
+        fsm.act("READ",
+            self.busy.eq(1),
+            NextValue(self.read_cycles.status, self.read_cycles.status + 1),
+            bus.cyc.eq(1),
+            bus.stb.eq(1),
+            bus.adr.eq(adr),
+            bus.sel.eq(0xf),
+            bus.cti.eq(Mux(last, CTI_END, CTI_INCREMENTING)),
+            If(bus.ack | bus.err,
+                gen_step.eq(1),
+                If(bus.err | (bus.dat_r != data),
+                    NextValue(self.errors.status, self.errors.status + 1),
+                    If(self.errors.status == 0,
+                        NextValue(self.first_error_addr.status, Cat(Constant(0, 2), adr)),
+                        NextValue(self.first_error_expected.status, data),
+                        NextValue(self.first_error_actual.status, bus.dat_r)
+                    )
+                ),
+                NextValue(adr, adr + 1),
+                NextValue(remaining, remaining - 1),
+                NextValue(index, Mux(last, 0, index + 1)),
+                If(remaining == 1,
+                    NextState("NEXT")
+                ).Elif(last,
+                    NextState("READ-GAP")
+                )
+            )
+        )
+        fsm.act("READ-GAP",
+            self.busy.eq(1),
+            NextValue(self.read_cycles.status, self.read_cycles.status + 1),
+            NextState("READ")
+        )
+        fsm.act("NEXT",
+            self.busy.eq(1),
+            If(all_mode & (pattern != PATTERN_PRBS),
+                NextValue(pattern, pattern + 1),
+                NextState("WRITE-INIT")
+            ).Else(
+                NextState("DONE")
+            )
+        )
+        fsm.act("DONE",
+            self.busy.eq(1),
+            self.ev.done.trigger.eq(1),
+            NextValue(done, 1),
+            NextValue(passed, self.errors.status == 0),
+            NextState("IDLE")
+        )
+        self.comb += [
+            self.status.fields.busy.eq(self.busy),
+            self.status.fields.done.eq(done),
+            self.status.fields.passed.eq(passed),
+        ]
@@ -0,0 +1,5 @@
+"""Wishbone DMA Core"""
+
+from .engine import DMAEngine
+
+__all__ = ["DMAEngine"]
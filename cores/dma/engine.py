@@ -0,0 +1,239 @@
+"""
+memcpy/memset DMA Engine
+
+Wishbone bus master controlled through CSRs.
+"""
+
+from migen import Signal, Array, If, Case
+from migen.genlib.fsm import FSM, NextState, NextValue
+
+from litex.gen import LiteXModule
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.csr import CSRStorage, CSRStatus, CSRField
+from litex.soc.interconnect.csr_eventmanager import EventManager, EventSourcePulse
+
+# Control modes.
+MODE_MEMCPY = 0
+MODE_MEMSET = 1
+MODE_CHAIN  = 2
+
+# Descriptor layout (four 32-bit words, 16-byte aligned):
+#   word 0: next descriptor address (0 = end of chain)
+#   word 1: source address (memcpy) or fill value (memset)
+#   word 2: destination address
+#   word 3: bits 23:0 length in bytes, bit 31 memset
+DESC_WORDS    = 4
+DESC_MEMSET   = 31
+
+# Wishbone cycle type identifiers.
+CTI_INCREMENTING = 0b010
+CTI_END          = 0b111
+
+
+class DMAEngine(LiteXModule):
+    """
+    memcpy/memset DMA Engine.
+
+    Features:
+      - memcpy and memset between any bus regions.
+      - Scatter-gather descriptor chains in memory.
+      - Incrementing Wishbone bursts of up to burst_length words, with the
+        bus released for a cycle after every burst (read or write) so other
+        masters get in during long transfers.
+      - Completion interrupt.
+
+    Addresses and lengths are word aligned; the low two bits are ignored.
+    Lengths are 24 bits wide, as in the descriptor format, so a single
+    transfer or descriptor moves at most 16 MiB - 4 bytes.
+    """
+
+    def __init__(self, burst_length=8):
+        """
+        Initialize DMA engine.
+
+        Args:
+            burst_length: Maximum number of words per bus burst.
+        """
+        self.bus = bus = wishbone.Interface(data_width=32)
+
+        # CSRs.
+        self.src = CSRStorage(32, description="Source byte address (memcpy).")
+        self.dst = CSRStorage(32, description="Destination byte address.")
+        self.length = CSRStorage(24, description="Transfer length in bytes (at most 16 MiB - 4).")
+        self.value = CSRStorage(32, description="Fill value (memset).")
+        self.desc = CSRStorage(32, description="First descriptor address (chain).")
+        self.control = CSRStorage(fields=[
+            CSRField("start", size=1, offset=0, pulse=True, description="Start transfer."),
+            CSRField("mode", size=2, offset=1, values=[
+                ("``0b00``", "memcpy."),
+                ("``0b01``", "memset."),
+                ("``0b10``", "Descriptor chain starting at ``desc``."),
+            ]),
+        ])
+        self.status = CSRStatus(fields=[
+            CSRField("busy",  size=1, offset=0, description="Transfer in progress."),
+            CSRField("error", size=1, offset=1, description="Last transfer hit a bus error."),
+        ])
+
+        self.ev = EventManager()
+        self.ev.done = EventSourcePulse(description="Transfer or chain complete.")
+        self.ev.finalize()
+
+        # Internal signals.
+        src       = Signal(30)
+        dst       = Signal(30)
+        remaining = Signal(22)
+        fill      = Signal(32)
+        memset    = Signal()
+        chain     = Signal()
+        desc      = Signal(30)
+        next_desc = Signal(30)
+        error     = Signal()
+        index     = Signal(max=max(burst_length, DESC_WORDS))
+        burst     = Signal(max=burst_length + 1)
+        last      = Signal()
+        buf       = Array(Signal(32) for _ in range(burst_length))
+
+        self.comb += [
+            If(remaining > burst_length,
+               burst.eq(burst_length)
+            ).Else(
+               burst.eq(remaining)
+            ),
+            self.status.fields.error.eq(error),
+        ]
+
+        # FSM.
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(self.control.fields.start,
+                NextValue(error, 0),
+                NextValue(index, 0),
+                If(self.control.fields.mode == MODE_CHAIN,
+                    NextValue(chain, 1),
+                    NextValue(desc, self.desc.storage[2:]),
+                    NextState("DESC")
+                ).Else(
+                    NextValue(chain, 0),
+                    NextValue(src, self.src.storage[2:]),
+                    NextValue(dst, self.dst.storage[2:]),
+                    NextValue(remaining, self.length.storage[2:]),
+                    NextValue(fill, self.value.storage),
+                    NextValue(memset, self.control.fields.mode == MODE_MEMSET),
+                    NextState("CHECK")
+                )
+            )
+        )
+        fsm.act("DESC",
+            self.status.fields.busy.eq(1),
+            bus.cyc.eq(1),
+            bus.stb.eq(1),
+            bus.adr.eq(desc + index),
+            bus.sel.eq(0xf),
+            bus.cti.eq(CTI_INCREMENTING),
+            If(index == DESC_WORDS - 1,
+                bus.cti.eq(CTI_END)
+            ),
+            If(bus.ack,
+                NextValue(index, index + 1),
+                Case(index, {
+                    0: NextValue(next_desc, bus.dat_r[2:]),
+                    1: [NextValue(src, bus.dat_r[2:]), NextValue(fill, bus.dat_r)],
+                    2: NextValue(dst, bus.dat_r[2:]),
+                    3: [NextValue(remaining, bus.dat_r[2:24]),
+                        NextValue(memset, bus.dat_r[DESC_MEMSET])],
+                }),
+                If(index == DESC_WORDS - 1,
+                    NextValue(index, 0),
+                    NextState("CHECK")
+                )
+            ),
+            If(bus.err,
+                NextValue(error, 1),
+                NextState("DONE")
+            )
+        )
+        fsm.act("CHECK",
+            self.status.fields.busy.eq(1),
+            If(remaining == 0,
+                NextState("NEXT")
+            ).Elif(memset,
+                NextState("WRITE")
+            ).Else(
+                NextState("READ")
+            )
+        )
+        self.comb += last.eq(index == (burst - 1))
+        fsm.act("READ",
+            self.status.fields.busy.eq(1),
+            bus.cyc.eq(1),
+            bus.stb.eq(1),
+            bus.adr.eq(src + index),
+            bus.sel.eq(0xf),
+            bus.cti.eq(CTI_INCREMENTING),
+            If(last,
+                bus.cti.eq(CTI_END)
+            ),
+            If(bus.ack,
+                NextValue(index, index + 1),
+                If(last,
+                    NextValue(index, 0),
+                    NextState("READ-GAP")
+                )
+            ),
+            If(bus.err,
+                NextValue(error, 1),
+                NextState("DONE")
+            )
+        )
+        self.sync += If(fsm.ongoing("READ") & bus.ack, buf[index].eq(bus.dat_r))
+        # Release the bus between the read and the write burst (CHECK does
+        # the same after each write burst).
+        fsm.act("READ-GAP",
+            self.status.fields.busy.eq(1),
+            NextState("WRITE")
+        )
+        fsm.act("WRITE",
+            self.status.fields.busy.eq(1),
+            bus.cyc.eq(1),
+            bus.stb.eq(1),
+            bus.we.eq(1),
+            bus.adr.eq(dst + index),
+            bus.sel.eq(0xf),
+            If(memset,
+                bus.dat_w.eq(fill)
+            ).Else(
+                bus.dat_w.eq(buf[index])
+            ),
+            bus.cti.eq(CTI_INCREMENTING),
+            If(last,
+                bus.cti.eq(CTI_END)
+            ),
+            If(bus.ack,
+                NextValue(index, index + 1),
+                If(last,
+                    NextValue(index, 0),
+                    NextValue(src, src + burst),
+                    NextValue(dst, dst + burst),
+                    NextValue(remaining, remaining - burst),
+                    NextState("CHECK")
+                )
+            ),
+            If(bus.err,
+                NextValue(error, 1),
+                NextState("DONE")
+            )
+        )
+        fsm.act("NEXT",
+            self.status.fields.busy.eq(1),
+            If(chain & (next_desc != 0),
+                NextValue(desc, next_desc),
+                NextState("DESC")
+            ).Else(
+                NextState("DONE")
+            )
+        )
+        fsm.act("DONE",
+            self.ev.done.trigger.eq(1),
+            NextState("IDLE")
+        )
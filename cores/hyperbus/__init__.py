@@ -1,6 +1,7 @@
 """HyperBus / HyperRAM Core"""
 
 from .controller import HyperRAMController
+from .frontend import HyperRAMFrontend
 
 
 def create_hyperram_controller(pads):
@@ -13,4 +14,4 @@ def create_hyperram_controller(pads):
     # You can tune latency globally here if needed.
     return HyperRAMController(pads=pads, latency=6)
 
-__all__ = ["HyperRAMController", "create_hyperram_controller"]
+__all__ = ["HyperRAMController", "HyperRAMFrontend", "create_hyperram_controller"]
@@ -0,0 +1,237 @@
+"""
+HyperRAM Multi-Port Front End
+
+Shares one HyperRAMController between several Wishbone masters with
+priority, weighted round-robin and aging, and per-port counters.
+"""
+
+from migen import Signal, Array, If, Case, Mux, Cat
+
+from litex.gen import LiteXModule
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.csr import CSRStorage, CSRStatus, CSRField
+
+
+class HyperRAMFrontend(LiteXModule):
+    """
+    HyperRAM Multi-Port Front End.
+
+    Ports are requested with get_port() before finalization. A granted port
+    keeps the controller for its whole Wishbone cycle, so bursts are never
+    split. Arbitration happens in the cycle after the owner drops cyc (the
+    controller is idle then), so an owner that releases the bus between
+    bursts still competes for the next grant. Among requesting ports the
+    winner is chosen by:
+
+      1. Age: a port waiting max_wait cycles or more (0 disables aging).
+      2. Priority: the port's priority CSR (0-15, higher wins).
+      3. Weight: ports with credits left win; a grant takes one credit and
+         credits reload to the weight CSR once all contenders are out, so
+         equal-priority ports share cycles in proportion to their weights.
+      4. The last granted port while it has credits left, otherwise
+         round-robin from it.
+
+    All-equal priorities and weights give plain round-robin; distinct
+    priorities with aging give strict priority without starvation. While a
+    port's lock signal is high, only locked ports are granted.
+
+    Per-port counters (with_counters): accesses (acked transfers), wait
+    (cycles requesting while another port owned the controller), latency
+    (sum of stb-to-ack cycles) and max_latency. Divide latency by accesses
+    for the mean; accesses * 4 over a timed interval gives bandwidth.
+    """
+
+    def __init__(self, bus, max_wait=1024, with_counters=True):
+        """
+        Initialize front end.
+
+        Args:
+            bus: Controller Wishbone interface (HyperRAMController.bus).
+            max_wait: Default aging threshold in cycles.
+            with_counters: Add per-port bandwidth/latency counters.
+        """
+        self.controller    = bus
+        self.with_counters = with_counters
+        self.ports         = []  # (name, interface, priority CSR, weight CSR)
+        self.locks         = []  # Lock signal (or None) per port.
+
+        self.max_wait = CSRStorage(16, reset=max_wait,
+            description="Cycles after which a waiting port beats all priorities (0: never).")
+        self.control = CSRStorage(fields=[
+            CSRField("clear", size=1, offset=0, pulse=True, description="Clear the port counters."),
+        ])
+
+    def get_port(self, name, priority=0, weight=1, lock=None):
+        """
+        Add a port and return its Wishbone slave interface.
+
+        Args:
+            name: Port name (prefix of its CSRs).
+            priority: Reset priority, 0-15.
+            weight: Reset weight (grants per round), 1-255.
+            lock: Optional signal reserving the memory for this port.
+        """
+        assert 0 <= priority < 16 and 1 <= weight < 256
+        port = wishbone.Interface(data_width=len(self.controller.dat_w))
+        prio_csr = CSRStorage(4, reset=priority, name=f"{name}_priority",
+            description=f"{name} port priority (higher wins).")
+        weight_csr = CSRStorage(8, reset=weight, name=f"{name}_weight",
+            description=f"{name} port grants per weighted round-robin round.")
+        setattr(self, f"{name}_priority", prio_csr)
+        setattr(self, f"{name}_weight", weight_csr)
+        if self.with_counters:
+            for counter, description in [
+                ("accesses",    "Acked transfers."),
+                ("wait",        "Cycles spent waiting for another port."),
+                ("latency",     "Sum of stb-to-ack cycles."),
+                ("max_latency", "Longest stb-to-ack time in cycles."),
+            ]:
+                setattr(self, f"{name}_{counter}",
+                    CSRStatus(32, name=f"{name}_{counter}", description=f"{name} port: {description}"))
+        self.ports.append((name, port, prio_csr, weight_csr))
+        self.locks.append(lock)
+        return port
+
+    def do_finalize(self):
+        n = len(self.ports)
+        assert n > 0, "HyperRAMFrontend needs at least one port"
+        ctrl  = self.controller
+        ports = [port for _, port, _, _ in self.ports]
+
+        grant  = Signal(max=max(n, 2))
+        owned  = Signal()  # grant holds the controller.
+        owner  = Array(ports)[grant]
+        req    = Signal(n)
+        locks  = [lock for lock in self.locks if lock is not None]
+        if locks:
+            locked = Signal()
+            self.comb += [
+                locked.eq(Cat(*locks) != 0),
+                req.eq(Cat(*[port.cyc & (~locked if lock is None else ~locked | lock)
+                    for port, lock in zip(ports, self.locks)])),
+            ]
+        else:
+            self.comb += req.eq(Cat(*[port.cyc for port in ports]))
+
+        # Datapath: the owner drives the controller.
+        self.comb += [
+            ctrl.adr.eq(owner.adr),
+            ctrl.dat_w.eq(owner.dat_w),
+            ctrl.sel.eq(owner.sel),
+            ctrl.we.eq(owner.we),
+            ctrl.cti.eq(owner.cti),
+            ctrl.bte.eq(owner.bte),
+            ctrl.cyc.eq(owned & owner.cyc),
+            ctrl.stb.eq(owned & owner.stb),
+        ]
+        for i, port in enumerate(ports):
+            self.comb += [
+                port.dat_r.eq(ctrl.dat_r),
+                port.ack.eq(ctrl.ack & owned & (grant == i)),
+                port.err.eq(ctrl.err & owned & (grant == i)),
+            ]
+
+        # Scores: aged, priority, has-credit, requesting (0 when idle).
+        credits = [Signal(8) for _ in range(n)]
+        waits   = [Signal(16) for _ in range(n)]
+        scores  = [Signal(7) for _ in range(n)]
+        for i, (_, _, prio, _) in enumerate(self.ports):
+            aged = Signal()
+            self.comb += [
+                aged.eq((self.max_wait.storage != 0) & (waits[i] >= self.max_wait.storage)),
+                scores[i].eq(Mux(req[i], Cat(req[i], credits[i] != 0, prio.storage, aged), 0)),
+            ]
+        best = scores[0]
+        for score in scores[1:]:
+            best = Mux(score > best, score, best)
+        best_score = Signal(7)
+        self.comb += best_score.eq(best)
+
+        # Among the best: keep the last port while it has credits, otherwise
+        # round-robin from the port after it.
+        next_grant = Signal(max=max(n, 2))
+        rr_cases = {}
+        for last in range(n):
+            order  = [(last + k) % n for k in range(1, n + 1)]
+            search = next_grant.eq(last)
+            for c in reversed(order):
+                search = If(scores[c] == best_score, next_grant.eq(c)).Else(search)
+            rr_cases[last] = If((scores[last] == best_score) & (credits[last] != 0),
+                next_grant.eq(last)
+            ).Else(search)
+        self.comb += Case(grant, rr_cases)
+
+        # Arbitration between cycles: the owner releases the controller when
+        # it drops cyc, the next grant is decided in the following (idle)
+        # cycle, where the previous owner can request again.
+        reload = Signal()
+        self.comb += [
+            # No contender at the best priority has credits left.
+            reload.eq(~best_score[1]),
+        ]
+        self.sync += If(owned,
+            If(~owner.cyc,
+                owned.eq(0)
+            )
+        ).Elif(req != 0,
+            owned.eq(1),
+            grant.eq(next_grant),
+            *[credits[i].eq(Mux(reload,
+                weight.storage - (next_grant == i),
+                credits[i] - ((next_grant == i) & (credits[i] != 0))))
+              for i, (_, _, _, weight) in enumerate(self.ports)]
+        )
+
+        # Aging.
+        waiting = [Signal() for _ in range(n)]
+        for i in range(n):
+            self.comb += waiting[i].eq(ports[i].cyc & ~(owned & (grant == i)))
+            self.sync += If(waiting[i],
+                If(waits[i] != 2**16 - 1,
+                    waits[i].eq(waits[i] + 1)
+                )
+            ).Else(
+                waits[i].eq(0)
+            )
+
+        if self.with_counters:
+            self._add_counters(waiting)
+
+    def _add_counters(self, waiting):
+        clear = self.control.fields.clear
+        for (name, port, _, _), port_waiting in zip(self.ports, waiting):
+            accesses    = getattr(self, f"{name}_accesses").status
+            wait        = getattr(self, f"{name}_wait").status
+            latency     = getattr(self, f"{name}_latency").status
+            max_latency = getattr(self, f"{name}_max_latency").status
+            current     = Signal(32)
+            done        = Signal()
+            self.comb += done.eq(port.ack | port.err)
+            self.sync += [
+                If(port.cyc & port.stb,
+                    If(done,
+                        current.eq(0)
+                    ).Else(
+                        current.eq(current + 1)
+                    )
+                ),
+                If(clear,
+                    accesses.eq(0),
+                    wait.eq(0),
+                    latency.eq(0),
+                    max_latency.eq(0)
+                ).Else(
+                    If(port.ack,
+                        accesses.eq(accesses + 1)
+                    ),
+                    If(port_waiting,
+                        wait.eq(wait + 1)
+                    ),
+                    If(done,
+                        latency.eq(latency + current + 1),
+                        If(current + 1 > max_latency,
+                            max_latency.eq(current + 1)
+                        )
+                    )
+                )
+            ]
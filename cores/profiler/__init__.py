@@ -0,0 +1,5 @@
+"""PC-Sampling Profiler Core"""
+
+from .sampler import PCSampler, FetchAddressTap
+
+__all__ = ["PCSampler", "FetchAddressTap"]
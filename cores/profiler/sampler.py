@@ -0,0 +1,196 @@
+"""
+PC-Sampling Profiler
+
+Periodically records the CPU program counter into a BSRAM ring buffer and
+streams the samples out over a UART.
+"""
+
+from migen import Signal, Constant, Memory, Array, If, Mux, Cat
+from migen.genlib.fsm import FSM, NextState, NextValue
+
+from litex.gen import LiteXModule
+from litex.soc.interconnect.csr import CSRStorage, CSRStatus, CSRField
+from litex.soc.interconnect.csr_eventmanager import EventManager, EventSourcePulse
+from litex.soc.cores.uart import RS232PHY
+
+# Stream framing: SYNC_BYTE followed by the PC, little-endian.
+SYNC_BYTE = 0xa5
+
+
+def _next_ptr(ptr, depth):
+    """ptr + 1, wrapping to 0 at depth."""
+    return Mux(ptr == depth - 1, 0, ptr + 1)
+
+
+class FetchAddressTap(LiteXModule):
+    """
+    Instruction fetch address seen on a CPU instruction bus.
+
+    pc holds the byte address of the last acknowledged fetch. Without an
+    instruction cache every instruction is fetched over ibus, so this is
+    the PC a few instructions ahead of execution; with a cache it would only
+    show line refills, hence callers must restrict it to cacheless cores.
+    """
+
+    def __init__(self, ibus):
+        self.pc = Signal(32)
+
+        adr = ibus.adr if ibus.addressing == "byte" else Cat(Constant(0, 2), ibus.adr)
+        self.sync += If(ibus.cyc & ibus.stb & ibus.ack & ~ibus.we,
+            self.pc.eq(adr)
+        )
+
+
+class PCSampler(LiteXModule):
+    """
+    PC-Sampling Profiler.
+
+    Sample sources:
+      - pc given (e.g. FetchAddressTap.pc): the PC is captured in hardware
+        every period cycles, without interrupting the CPU.
+      - pc None: the sample event fires every period cycles and the
+        interrupt handler writes mepc to the sample CSR; firmware/profiler
+        provides that handler.
+
+    Samples go to a depth-entry ring buffer; when full, new samples are
+    counted in dropped. With pads the buffer is drained to a UART as
+    SYNC_BYTE + 4 PC bytes per sample, otherwise by reading data, which
+    removes the sample it returns (so a burst of data reads drains the
+    buffer without writes in between).
+    """
+
+    def __init__(self, clk_freq, pc=None, pads=None, baudrate=1_000_000,
+                 depth=1024, sample_rate=1000):
+        """
+        Initialize profiler.
+
+        Args:
+            clk_freq: System clock frequency in Hz.
+            pc: Optional program counter signal from the CPU.
+            pads: Optional UART pads for streaming.
+            baudrate: Streaming UART baud rate.
+            depth: Ring buffer entries.
+            sample_rate: Default sampling rate in Hz.
+        """
+        # CSRs.
+        self.enable = CSRStorage(1, description="Enable sampling.")
+        self.period = CSRStorage(32, reset=int(clk_freq // sample_rate),
+            description="Sampling period in sys_clk cycles.")
+        self.sample = CSRStorage(32, description="Write the interrupted PC (interrupt mode).")
+        self.level = CSRStatus(32, description="Samples in the ring buffer.")
+        self.dropped = CSRStatus(32, description="Samples lost to a full ring buffer.")
+        self.data = CSRStatus(32, description="Oldest sample, removed by the read (CSR drain mode).")
+        self.control = CSRStorage(fields=[
+            CSRField("clear", size=1, offset=0, pulse=True, description="Empty the ring buffer."),
+        ])
+
+        if pc is None:
+            self.ev = EventManager()
+            self.ev.sample = EventSourcePulse(description="Sampling period elapsed.")
+            self.ev.finalize()
+
+        # Sample timer.
+        count = Signal(32)
+        tick  = Signal()
+        self.sync += [
+            tick.eq(0),
+            If(~self.enable.storage,
+                count.eq(0)
+            ).Elif(count == 0,
+                count.eq(self.period.storage - 1),
+                tick.eq(1)
+            ).Else(
+                count.eq(count - 1)
+            )
+        ]
+
+        push      = Signal()
+        push_data = Signal(32)
+        if pc is None:
+            self.comb += [
+                self.ev.sample.trigger.eq(tick),
+                push.eq(self.sample.re),
+                push_data.eq(self.sample.storage),
+            ]
+        else:
+            self.comb += [
+                push.eq(tick),
+                push_data.eq(pc),
+            ]
+
+        # Ring buffer.
+        mem = Memory(32, depth)
+        wr  = mem.get_port(write_capable=True)
+        rd  = mem.get_port(async_read=False)
+        self.specials += mem, wr, rd
+
+        wr_ptr = Signal(max=depth)
+        rd_ptr = Signal(max=depth)
+        level  = Signal(max=depth + 1)
+        pop    = Signal()
+        full   = Signal()
+        self.comb += [
+            full.eq(level == depth),
+            wr.adr.eq(wr_ptr),
+            wr.dat_w.eq(push_data),
+            wr.we.eq(push & ~full),
+            rd.adr.eq(rd_ptr),
+            self.level.status.eq(level),
+        ]
+        self.sync += [
+            If(self.control.fields.clear,
+                wr_ptr.eq(0),
+                rd_ptr.eq(0),
+                level.eq(0)
+            ).Else(
+                If(push & ~full,
+                    wr_ptr.eq(_next_ptr(wr_ptr, depth))
+                ),
+                If(pop,
+                    rd_ptr.eq(_next_ptr(rd_ptr, depth))
+                ),
+                level.eq(level + (push & ~full) - pop)
+            ),
+            If(push & full,
+                self.dropped.status.eq(self.dropped.status + 1)
+            )
+        ]
+
+        if pads is None:
+            # CSR drain: data shows the oldest sample, reading it pops it.
+            self.comb += [
+                self.data.status.eq(rd.dat_r),
+                pop.eq(self.data.we & (level != 0)),
+            ]
+            return
+
+        # UART drain.
+        self.phy = phy = RS232PHY(pads, clk_freq, baudrate)
+        word  = Signal(32)
+        index = Signal(3)
+        self.comb += phy.sink.data.eq(
+            Array([Constant(SYNC_BYTE, 8), word[0:8], word[8:16], word[16:24], word[24:32]])[index]
+        )
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(level != 0,
+                NextState("READ")
+            )
+        )
+        # Synchronous read: rd.dat_r is valid one cycle after rd.adr.
+        fsm.act("READ",
+            NextValue(word, rd.dat_r),
+            NextValue(index, 0),
+            pop.eq(1),
+            NextState("SEND")
+        )
+        fsm.act("SEND",
+            phy.sink.valid.eq(1),
+            If(phy.sink.ready,
+                NextValue(index, index + 1),
+                If(index == 4,
+                    NextState("IDLE")
+                )
+            )
+        )
+
@@ -0,0 +1,5 @@
+"""Timer Cores"""
+
+from .cycle import CycleTimer
+
+__all__ = ["CycleTimer"]
@@ -0,0 +1,98 @@
+"""
+64-bit Cycle Timer
+
+Free-running sys_clk cycle counter with compare channels, read with plain
+loads (mtime/mtimecmp-style).
+"""
+
+from migen import Signal, If, Case, Cat, Replicate
+
+from litex.gen import LiteXModule
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.csr_eventmanager import EventManager, EventSourceLevel
+
+# Register map (byte offsets).
+TIME_LO      = 0x00  # Low word; reading it latches the high word.
+TIME_HI      = 0x04  # High word latched by the last TIME_LO read.
+TIME_HI_LIVE = 0x08  # High word, not latched.
+PENDING      = 0x0c  # Bit n: time >= CMPn.
+CMP_BASE     = 0x10  # CMPn_LO at CMP_BASE + 8n, CMPn_HI at CMP_BASE + 8n + 4.
+
+
+class CycleTimer(LiteXModule):
+    """
+    64-bit Cycle Timer.
+
+    Reading the time takes two loads: TIME_LO, then TIME_HI (latched by the
+    first load, so the pair is consistent even across a carry). The latch
+    is shared: code that may be interrupted by another reader should use
+    the TIME_HI_LIVE / TIME_LO / TIME_HI_LIVE retry loop instead.
+
+    A channel is pending while time >= CMPn; all channels share the level
+    "compare" event. Writing CMPn re-arms (or clears) the channel. CMP
+    registers reset to all ones (never). To change a compare value without
+    a spurious match, write CMPn_HI = 0xffffffff, then CMPn_LO, then CMPn_HI.
+    """
+
+    def __init__(self, channels=4):
+        """
+        Initialize cycle timer.
+
+        Args:
+            channels: Number of compare channels.
+        """
+        assert CMP_BASE // 4 + 2 * channels <= 64, "Too many compare channels"
+        self.bus = wishbone.Interface(data_width=32)
+
+        self.ev = EventManager()
+        self.ev.compare = EventSourceLevel(description="A compare channel is pending.")
+        self.ev.finalize()
+
+        # Counter and compare.
+        time    = Signal(64)
+        time_hi = Signal(32)  # Latched high word.
+        compare = [Signal(64, reset=2**64 - 1) for _ in range(channels)]
+        pending = Signal(channels)
+        self.sync += time.eq(time + 1)
+        self.comb += [
+            pending.eq(Cat(*[time >= c for c in compare])),
+            self.ev.compare.trigger.eq(pending != 0),
+        ]
+
+        # Wishbone slave (single-cycle, ack the cycle after stb).
+        adr   = Signal(6)
+        read  = Signal(32)
+        self.comb += adr.eq(self.bus.adr[:6])
+        read_cases = {
+            TIME_LO      // 4: read.eq(time[:32]),
+            TIME_HI      // 4: read.eq(time_hi),
+            TIME_HI_LIVE // 4: read.eq(time[32:]),
+            PENDING      // 4: read.eq(pending),
+        }
+        write_cases = {}
+        for n in range(channels):
+            lo = (CMP_BASE + 8 * n) // 4
+            read_cases[lo]      = read.eq(compare[n][:32])
+            read_cases[lo + 1]  = read.eq(compare[n][32:])
+            write_cases[lo]     = compare[n][:32].eq(self._merge(compare[n][:32]))
+            write_cases[lo + 1] = compare[n][32:].eq(self._merge(compare[n][32:]))
+        read_cases["default"] = read.eq(0)
+        self.comb += Case(adr, read_cases)
+
+        self.sync += [
+            self.bus.ack.eq(0),
+            If(self.bus.cyc & self.bus.stb & ~self.bus.ack,
+                self.bus.ack.eq(1),
+                self.bus.dat_r.eq(read),
+                If(self.bus.we,
+                    Case(adr, write_cases)
+                ).Elif(adr == TIME_LO // 4,
+                    time_hi.eq(time[32:])
+                )
+            )
+        ]
+
+    def _merge(self, word):
+        """word updated with the bus write data under the byte enables."""
+        sel = Cat(*[Replicate(self.bus.sel[n], 8) for n in range(4)])
+        return (word & ~sel) | (self.bus.dat_w & sel)
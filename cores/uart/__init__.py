@@ -0,0 +1,7 @@
+"""Streaming UART Core"""
+
+from .dma import DMAUART
+from .bridge import BufferedUARTBone
+from .crc import BusCRC32
+
+__all__ = ["DMAUART", "BufferedUARTBone", "BusCRC32"]
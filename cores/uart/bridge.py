@@ -0,0 +1,47 @@
+"""
+Buffered UART-to-Wishbone Bridge
+
+UARTBone with an RX FIFO in front, so a host can pipeline commands.
+"""
+
+from litex.gen import LiteXModule
+from litex.soc.interconnect import stream
+from litex.soc.cores.uart import RS232PHY, UARTBone
+
+
+class _BufferedPHY:
+    """PHY view handed to UARTBone: buffered source, direct sink."""
+
+    def __init__(self, source, sink):
+        self.source = source
+        self.sink   = sink
+
+
+class BufferedUARTBone(LiteXModule):
+    """
+    Buffered UART-to-Wishbone Bridge.
+
+    The plain UARTBone drops bytes that arrive while it is busy answering a
+    read. The RX FIFO lets the host keep up to fifo_depth command bytes in
+    flight, e.g. several read commands while the previous response is
+    still being sent.
+    """
+
+    def __init__(self, pads, clk_freq, baudrate=1_000_000, fifo_depth=64):
+        """
+        Initialize bridge.
+
+        Args:
+            pads: UART pads (tx, rx).
+            clk_freq: System clock frequency in Hz.
+            baudrate: Line rate in baud.
+            fifo_depth: RX FIFO depth in bytes.
+        """
+        self.fifo_depth = fifo_depth
+
+        self.phy     = phy     = RS232PHY(pads, clk_freq, baudrate)
+        self.rx_fifo = rx_fifo = stream.SyncFIFO([("data", 8)], fifo_depth, buffered=True)
+        self.comb += phy.source.connect(rx_fifo.sink)
+
+        self.bridge = UARTBone(phy=_BufferedPHY(rx_fifo.source, phy.sink), clk_freq=clk_freq)
+        self.wishbone = self.bridge.wishbone
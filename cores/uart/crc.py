@@ -0,0 +1,114 @@
+"""
+Bus CRC32
+
+Wishbone bus master computing the CRC32 of a memory range, so a host
+loading through the UART bridge can verify an image with one word read
+instead of reading it back.
+"""
+
+from functools import reduce
+from operator import xor
+
+from migen import Signal, If, Cat
+from migen.genlib.fsm import FSM, NextState, NextValue
+
+from litex.gen import LiteXModule
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.csr import CSRStorage, CSRStatus, CSRField
+
+# CRC-32 as in zlib.crc32: reflected, polynomial 0x04c11db7, all ones
+# initial value and final XOR.
+CRC32_POLY = 0xedb88320
+CRC32_INIT = 0xffffffff
+
+
+def _crc32_word_terms():
+    """
+    XOR terms of one 32-bit CRC32 step.
+
+    Returns one (crc bits, data bits) pair per next-state bit. Data bits
+    are fed LSB first, which for little-endian words is byte order.
+    """
+    crc = [({n}, set()) for n in range(32)]
+    for bit in range(32):
+        feedback = (crc[0][0], crc[0][1] ^ {bit})
+        crc = crc[1:] + [(set(), set())]
+        for n in range(32):
+            if (CRC32_POLY >> n) & 1:
+                crc[n] = (crc[n][0] ^ feedback[0], crc[n][1] ^ feedback[1])
+    return crc
+
+
+def crc32_next(crc, data):
+    """Expression for the CRC32 after feeding the 32-bit little-endian word data."""
+    return Cat(*[reduce(xor, [crc[n] for n in sorted(c)] + [data[n] for n in sorted(d)])
+                 for c, d in _crc32_word_terms()])
+
+
+class BusCRC32(LiteXModule):
+    """
+    Bus CRC32.
+
+    Reads length bytes from base, one word per access, and leaves the
+    CRC32 of the range in result (zlib.crc32 of the same bytes). Base and
+    length are word aligned; the low two bits are ignored. result is valid
+    once busy has dropped; error flags a bus error on the way.
+    """
+
+    def __init__(self):
+        self.bus = bus = wishbone.Interface(data_width=32)
+
+        # CSRs.
+        self.base = CSRStorage(32, description="Start byte address.")
+        self.length = CSRStorage(32, description="Length in bytes.")
+        self.control = CSRStorage(fields=[
+            CSRField("start", size=1, offset=0, pulse=True, description="Start computing."),
+        ])
+        self.status = CSRStatus(fields=[
+            CSRField("busy",  size=1, offset=0, description="Computation in progress."),
+            CSRField("error", size=1, offset=1, description="Last computation hit a bus error."),
+        ])
+        self.result = CSRStatus(32, description="CRC32 of the last range.")
+
+        # Internal signals.
+        adr       = Signal(30)
+        remaining = Signal(30)
+        crc       = Signal(32)
+        error     = Signal()
+
+        self.comb += [
+            self.result.status.eq(~crc),
+            self.status.fields.error.eq(error),
+        ]
+
+        # FSM.
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(self.control.fields.start,
+                NextValue(adr, self.base.storage[2:]),
+                NextValue(remaining, self.length.storage[2:]),
+                NextValue(crc, CRC32_INIT),
+                NextValue(error, 0),
+                NextState("READ")
+            )
+        )
+        fsm.act("READ",
+            self.status.fields.busy.eq(1),
+            If(remaining == 0,
+                NextState("IDLE")
+            ).Else(
+                bus.cyc.eq(1),
+                bus.stb.eq(1),
+                bus.adr.eq(adr),
+                bus.sel.eq(0xf),
+                If(bus.ack,
+                    NextValue(adr, adr + 1),
+                    NextValue(remaining, remaining - 1),
+                    NextValue(crc, crc32_next(crc, bus.dat_r))
+                ),
+                If(bus.err,
+                    NextValue(error, 1),
+                    NextState("IDLE")
+                )
+            )
+        )
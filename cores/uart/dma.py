@@ -0,0 +1,251 @@
+"""
+UART with RX/TX DMA
+
+High-baud UART that moves data between deep FIFOs and memory without
+CPU involvement.
+"""
+
+from migen import Signal, Array, If, Mux, Cat
+from migen.genlib.fsm import FSM, NextState, NextValue
+
+from litex.gen import LiteXModule
+from litex.soc.interconnect import stream, wishbone
+from litex.soc.interconnect.csr import CSRStorage, CSRStatus, CSRField
+from litex.soc.interconnect.csr_eventmanager import EventManager, EventSourcePulse
+from litex.soc.cores.uart import RS232PHY
+
+
+def _insert_byte(word, byte, lane):
+    """Return word with byte placed in the given byte lane."""
+    parts = [byte]
+    if lane > 0:
+        parts.insert(0, word[:8*lane])
+    if lane < 3:
+        parts.append(word[8*(lane + 1):])
+    return Cat(*parts)
+
+
+class DMAUART(LiteXModule):
+    """
+    UART with RX/TX DMA.
+
+    Features:
+      - Configurable (multi-Mbaud) baud rate.
+      - Deep RX/TX FIFOs in block RAM.
+      - RX DMA into a ring buffer in memory with idle-line detection.
+      - TX DMA from a memory buffer.
+
+    RX: bytes are packed into words and written with byte enables to
+    rx_base + rx_wr. rx_wr only advances once data is in memory; software
+    consumes up to rx_wr and writes its position to rx_rd. The ring is full
+    when rx_wr + 1 == rx_rd, bytes then back up into the FIFO and are
+    counted in rx_dropped once it overflows. The rx_idle event fires when
+    the line stayed idle for rx_idle_timeout cycles after receiving data, with
+    any partial word already flushed to memory.
+
+    TX: tx_length bytes starting at tx_src are sent; tx_done fires at the end.
+
+    A bus error sets the sticky error bit in rx_status (cleared by disabling
+    RX) or tx_status (cleared by the next start); TX stops at the error and
+    fires tx_done.
+
+    rx_base and rx_size must be word aligned.
+    """
+
+    def __init__(self, pads, clk_freq, baudrate=3_000_000, fifo_depth=512):
+        """
+        Initialize DMA UART.
+
+        Args:
+            pads: UART pads (tx, rx).
+            clk_freq: System clock frequency in Hz.
+            baudrate: Line rate in baud.
+            fifo_depth: RX and TX FIFO depth in bytes.
+        """
+        self.bus = wishbone.Interface(data_width=32)
+        rx_bus   = wishbone.Interface(data_width=32)
+        tx_bus   = wishbone.Interface(data_width=32)
+        self.arbiter = wishbone.Arbiter([rx_bus, tx_bus], self.bus)
+
+        self.phy     = phy     = RS232PHY(pads, clk_freq, baudrate)
+        self.rx_fifo = rx_fifo = stream.SyncFIFO([("data", 8)], fifo_depth, buffered=True)
+        self.tx_fifo = tx_fifo = stream.SyncFIFO([("data", 8)], fifo_depth, buffered=True)
+        self.comb += [
+            phy.source.connect(rx_fifo.sink),
+            tx_fifo.source.connect(phy.sink),
+        ]
+
+        # CSRs.
+        self.rx_base = CSRStorage(32, description="RX ring buffer byte address.")
+        self.rx_size = CSRStorage(32, description="RX ring buffer size in bytes.")
+        self.rx_enable = CSRStorage(1, description="Enable RX DMA (clearing resets rx_wr).")
+        self.rx_wr = CSRStatus(32, description="RX write offset (bytes in memory).")
+        self.rx_rd = CSRStorage(32, description="RX read offset (bytes consumed by software).")
+        self.rx_idle_timeout = CSRStorage(32, reset=int(20 * clk_freq / baudrate),
+            description="Idle-line timeout in sys_clk cycles (default: two characters).")
+        self.rx_dropped = CSRStatus(32, description="Bytes lost to RX FIFO overflow.")
+        self.tx_src = CSRStorage(32, description="TX buffer byte address.")
+        self.tx_length = CSRStorage(32, description="TX length in bytes.")
+        self.tx_control = CSRStorage(fields=[
+            CSRField("start", size=1, offset=0, pulse=True, description="Start TX DMA."),
+        ])
+        self.tx_status = CSRStatus(fields=[
+            CSRField("busy", size=1, offset=0, description="TX DMA in progress."),
+            CSRField("error", size=1, offset=1, description="Last TX DMA hit a bus error."),
+        ])
+        self.rx_status = CSRStatus(fields=[
+            CSRField("error", size=1, offset=0, description="RX DMA hit a bus error since enabled."),
+        ])
+
+        self.ev = EventManager()
+        self.ev.rx_idle = EventSourcePulse(description="RX line idle after data.")
+        self.ev.tx_done = EventSourcePulse(description="TX DMA complete.")
+        self.ev.finalize()
+
+        self.sync += If(phy.source.valid & ~rx_fifo.sink.ready,
+            self.rx_dropped.status.eq(self.rx_dropped.status + 1)
+        )
+
+        # RX idle detection ------------------------------------------------------------------------
+        idle_count = Signal(32)
+        idle       = Signal()
+        got_data   = Signal()
+        self.comb += idle.eq(idle_count >= self.rx_idle_timeout.storage)
+        self.sync += [
+            If(phy.source.valid,
+                idle_count.eq(0)
+            ).Elif(~idle,
+                idle_count.eq(idle_count + 1)
+            )
+        ]
+
+        # RX DMA -----------------------------------------------------------------------------------
+        rx_error  = Signal()
+        wr_next   = Signal(32)  # Bytes accepted from the FIFO.
+        acc       = Signal(32)
+        acc_sel   = Signal(4)
+        acc_adr   = Signal(30)
+        idle_fl   = Signal()
+        lane      = Signal(2)
+        wr_wrap   = Signal(32)
+        full      = Signal()
+        rx_byte   = Signal(8)
+        self.comb += [
+            lane.eq(wr_next[:2]),
+            rx_byte.eq(rx_fifo.source.data),
+            wr_wrap.eq(Mux(wr_next == self.rx_size.storage - 1, 0, wr_next + 1)),
+            full.eq(wr_wrap == self.rx_rd.storage),
+            self.rx_status.fields.error.eq(rx_error),
+        ]
+
+        self.rx_fsm = rx_fsm = FSM(reset_state="DISABLED")
+        rx_fsm.act("DISABLED",
+            # Discard incoming bytes while disabled.
+            rx_fifo.source.ready.eq(1),
+            NextValue(wr_next, 0),
+            NextValue(acc_sel, 0),
+            NextValue(got_data, 0),
+            NextValue(self.rx_wr.status, 0),
+            NextValue(rx_error, 0),
+            If(self.rx_enable.storage,
+                NextState("FILL")
+            )
+        )
+        rx_fsm.act("FILL",
+            If(~self.rx_enable.storage,
+                NextState("DISABLED")
+            ).Elif(rx_fifo.source.valid & ~full,
+                rx_fifo.source.ready.eq(1),
+                NextValue(got_data, 1),
+                NextValue(acc_adr, self.rx_base.storage[2:] + wr_next[2:]),
+                NextValue(acc, Array(_insert_byte(acc, rx_byte, n) for n in range(4))[lane]),
+                NextValue(acc_sel, acc_sel | (1 << lane)),
+                NextValue(wr_next, wr_wrap),
+                If((lane == 3) | (wr_wrap == 0),
+                    NextValue(idle_fl, 0),
+                    NextState("FLUSH")
+                )
+            ).Elif(idle & ~rx_fifo.source.valid & got_data,
+                If(acc_sel != 0,
+                    NextValue(idle_fl, 1),
+                    NextState("FLUSH")
+                ).Else(
+                    self.ev.rx_idle.trigger.eq(1),
+                    NextValue(got_data, 0)
+                )
+            )
+        )
+        rx_fsm.act("FLUSH",
+            rx_bus.cyc.eq(1),
+            rx_bus.stb.eq(1),
+            rx_bus.we.eq(1),
+            rx_bus.adr.eq(acc_adr),
+            rx_bus.dat_w.eq(acc),
+            rx_bus.sel.eq(acc_sel),
+            If(rx_bus.err,
+                NextValue(rx_error, 1)
+            ),
+            If(rx_bus.ack | rx_bus.err,
+                NextValue(acc_sel, 0),
+                NextValue(self.rx_wr.status, wr_next),
+                If(idle_fl,
+                    self.ev.rx_idle.trigger.eq(1),
+                    NextValue(got_data, 0)
+                ),
+                NextState("FILL")
+            )
+        )
+
+        # TX DMA -----------------------------------------------------------------------------------
+        tx_error     = Signal()
+        tx_adr       = Signal(32)
+        tx_remaining = Signal(32)
+        tx_word      = Signal(32)
+        self.comb += [
+            tx_fifo.sink.data.eq(Array(tx_word[8*n:8*(n + 1)] for n in range(4))[tx_adr[:2]]),
+            self.tx_status.fields.error.eq(tx_error),
+        ]
+
+        self.tx_fsm = tx_fsm = FSM(reset_state="IDLE")
+        tx_fsm.act("IDLE",
+            If(self.tx_control.fields.start,
+                NextValue(tx_adr, self.tx_src.storage),
+                NextValue(tx_remaining, self.tx_length.storage),
+                NextValue(tx_error, 0),
+                If(self.tx_length.storage != 0,
+                    NextState("FETCH")
+                )
+            )
+        )
+        tx_fsm.act("FETCH",
+            self.tx_status.fields.busy.eq(1),
+            tx_bus.cyc.eq(1),
+            tx_bus.stb.eq(1),
+            tx_bus.adr.eq(tx_adr[2:]),
+            tx_bus.sel.eq(0xf),
+            If(tx_bus.err,
+                NextValue(tx_error, 1),
+                NextState("DONE")
+            ).Elif(tx_bus.ack,
+                NextValue(tx_word, tx_bus.dat_r),
+                NextState("SEND")
+            )
+        )
+        tx_fsm.act("SEND",
+            self.tx_status.fields.busy.eq(1),
+            tx_fifo.sink.valid.eq(1),
+            If(tx_fifo.sink.ready,
+                NextValue(tx_adr, tx_adr + 1),
+                NextValue(tx_remaining, tx_remaining - 1),
+                If(tx_remaining == 1,
+                    NextState("DONE")
+                ).Elif(tx_adr[:2] == 3,
+                    NextState("FETCH")
+                )
+            )
+        )
+        tx_fsm.act("DONE",
+            self.ev.tx_done.trigger.eq(1),
+            NextState("IDLE")
+        )
+
@@ -0,0 +1,5 @@
+"""Video Output Core"""
+
+from .scanout import LineBufferedScanout
+
+__all__ = ["LineBufferedScanout"]
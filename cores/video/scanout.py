@@ -0,0 +1,256 @@
+"""
+Line-Buffered Framebuffer Scanout
+
+Fetches framebuffer lines from memory into a BSRAM line buffer and
+streams them to a video PHY.
+"""
+
+from migen import Signal, Memory, Array, If, Mux, Cat
+from migen.genlib.cdc import MultiReg
+from migen.genlib.fsm import FSM, NextState, NextValue
+
+from litex.gen import LiteXModule
+from litex.soc.interconnect import stream, wishbone
+from litex.soc.interconnect.csr import CSRStorage, CSRStatus
+from litex.soc.cores.video import video_timing_layout, video_data_layout
+
+# Bits per pixel of the supported framebuffer formats.
+FORMAT_DEPTH = {
+    "rgb332": 8,
+    "rgb565": 16,
+    "rgb888": 32,
+}
+
+# Wishbone cycle type identifiers.
+CTI_INCREMENTING = 0b010
+CTI_END          = 0b111
+
+
+class LineBufferedScanout(LiteXModule):
+    """
+    Line-Buffered Framebuffer Scanout.
+
+    The framebuffer holds (hres / scale) x (vres / scale) pixels; each
+    source pixel is replicated scale times horizontally and vertically, so
+    memory bandwidth drops by scale^2 compared to a full resolution frame.
+
+    Two source lines live in a dual-clock BSRAM line buffer: while one is
+    displayed (scale output lines), the next is fetched in bursts of
+    burst_length words, releasing the bus between bursts so the CPU keeps
+    getting slots. A line that is not fully fetched when its display
+    starts is counted in the underflows CSR.
+    """
+
+    def __init__(self, hres, vres, scale=1, format="rgb565", base=0,
+                 clock_domain="sys", burst_length=8):
+        """
+        Initialize scanout engine.
+
+        Args:
+            hres, vres: Output resolution (must match the timing generator).
+            scale: Pixel replication factor (power of two).
+            format: Framebuffer pixel format, see FORMAT_DEPTH.
+            base: Default framebuffer byte address; non-zero also enables
+                fetching at reset.
+            clock_domain: Pixel clock domain.
+            burst_length: Maximum words per bus burst (power of two).
+        """
+        assert scale & (scale - 1) == 0, "scale must be a power of two"
+        assert burst_length & (burst_length - 1) == 0, "burst_length must be a power of two"
+        depth      = FORMAT_DEPTH[format]
+        ppw        = 32 // depth
+        src_hres   = hres // scale
+        src_vres   = vres // scale
+        line_words = src_hres // ppw
+        assert src_hres % ppw == 0, "source line must be a whole number of words"
+
+        self.hres     = hres
+        self.vres     = vres
+        self.src_hres = src_hres
+        self.src_vres = src_vres
+        self.depth    = depth
+        self.size     = src_hres * src_vres * depth // 8
+
+        self.bus      = bus      = wishbone.Interface(data_width=32)
+        self.vtg_sink = vtg_sink = stream.Endpoint(video_timing_layout)
+        self.source   = source   = stream.Endpoint(video_data_layout)
+
+        # CSRs.
+        self.base       = CSRStorage(32, reset=base, description="Framebuffer byte address.")
+        self.enable     = CSRStorage(1, reset=int(base != 0), description="Enable line fetching.")
+        self.underflows = CSRStatus(32, description="Lines displayed before being fully fetched.")
+        self.frames     = CSRStatus(32, description="Frames started.")
+
+        # Line buffer (two source lines).
+        mem = Memory(32, 2 * line_words)
+        wr  = mem.get_port(write_capable=True)
+        rd  = mem.get_port(clock_domain=clock_domain)
+        self.specials += mem, wr, rd
+
+        scale_shift = (scale - 1).bit_length()
+        ppw_shift   = (ppw - 1).bit_length()
+
+        # Pixel domain -----------------------------------------------------------------------------
+        sync_pix = getattr(self.sync, clock_domain)
+
+        x            = Signal(16)
+        y            = Signal(16)
+        de_d         = Signal()
+        vsync_d      = Signal()
+        frame_toggle = Signal()
+        line_toggle  = Signal()
+        src_x        = Signal(16)
+        src_y        = Signal(16)
+
+        self.comb += [
+            vtg_sink.ready.eq(1),
+            src_x.eq(x[scale_shift:]),
+            src_y.eq(y[scale_shift:]),
+            rd.adr.eq(Mux(src_y[0], line_words, 0) + src_x[ppw_shift:]),
+        ]
+        sync_pix += If(vtg_sink.valid,
+            de_d.eq(vtg_sink.de),
+            vsync_d.eq(vtg_sink.vsync),
+            If(vtg_sink.de,
+                x.eq(x + 1)
+            ),
+            # End of active line.
+            If(de_d & ~vtg_sink.de,
+                x.eq(0),
+                y.eq(y + 1)
+            ),
+            # Start of a new source line.
+            If(vtg_sink.de & ~de_d & (y[:scale_shift] == 0 if scale_shift else 1),
+                line_toggle.eq(~line_toggle)
+            ),
+            # Start of frame.
+            If(vtg_sink.vsync & ~vsync_d,
+                y.eq(0),
+                frame_toggle.eq(~frame_toggle)
+            )
+        )
+
+        # Align timing with the synchronous line buffer read.
+        de    = Signal()
+        hsync = Signal()
+        vsync = Signal()
+        sub   = Signal(max(ppw_shift, 1))
+        sync_pix += [
+            de.eq(vtg_sink.de),
+            hsync.eq(vtg_sink.hsync),
+            vsync.eq(vtg_sink.vsync),
+            sub.eq(src_x[:ppw_shift] if ppw_shift else 0),
+        ]
+
+        pixel = Signal(depth)
+        self.comb += pixel.eq(Array(rd.dat_r[n*depth:(n + 1)*depth] for n in range(ppw))[sub])
+        if format == "rgb332":
+            r, g, b = pixel[5:8], pixel[2:5], pixel[0:2]
+            rgb = [Cat(r[1:3], r, r), Cat(g[1:3], g, g), Cat(b, b, b, b)]
+        elif format == "rgb565":
+            r, g, b = pixel[11:16], pixel[5:11], pixel[0:5]
+            rgb = [Cat(r[2:5], r), Cat(g[4:6], g), Cat(b[2:5], b)]
+        else:
+            rgb = [pixel[16:24], pixel[8:16], pixel[0:8]]
+
+        self.comb += [
+            source.valid.eq(1),
+            source.de.eq(de),
+            source.hsync.eq(hsync),
+            source.vsync.eq(vsync),
+            If(de,
+                source.r.eq(rgb[0]),
+                source.g.eq(rgb[1]),
+                source.b.eq(rgb[2]),
+            )
+        ]
+
+        # System domain ----------------------------------------------------------------------------
+        frame_sync = Signal()
+        line_sync  = Signal()
+        frame_d    = Signal()
+        line_d     = Signal()
+        frame_evt  = Signal()
+        line_evt   = Signal()
+        self.specials += [
+            MultiReg(frame_toggle, frame_sync),
+            MultiReg(line_toggle, line_sync),
+        ]
+        self.sync += [
+            frame_d.eq(frame_sync),
+            line_d.eq(line_sync),
+        ]
+        self.comb += [
+            frame_evt.eq(frame_sync ^ frame_d),
+            line_evt.eq(line_sync ^ line_d),
+        ]
+
+        started     = Signal(16)  # Source lines whose display has started.
+        fetched     = Signal(16)  # Source lines fully in the line buffer.
+        restart     = Signal()
+        restart_ack = Signal()
+        self.sync += [
+            If(frame_evt,
+                started.eq(0),
+                self.frames.status.eq(self.frames.status + 1)
+            ).Elif(line_evt,
+                started.eq(started + 1),
+                If(self.enable.storage & (fetched <= started),
+                    self.underflows.status.eq(self.underflows.status + 1)
+                )
+            ),
+            If(frame_evt,
+                restart.eq(1)
+            ).Elif(restart_ack,
+                restart.eq(0)
+            )
+        ]
+
+        # Line fetch: line N goes to buffer N & 1 once line N - 1 is on screen.
+        line_adr  = Signal(30)
+        index     = Signal(max=line_words)
+        last      = Signal()
+        burst_end = Signal()
+        self.comb += [
+            last.eq(index == line_words - 1),
+            burst_end.eq(last | (index[:(burst_length - 1).bit_length()] == burst_length - 1)),
+            wr.adr.eq(Mux(fetched[0], line_words, 0) + index),
+            wr.dat_w.eq(bus.dat_r),
+        ]
+
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(restart,
+                restart_ack.eq(1),
+                NextValue(fetched, 0),
+                NextValue(line_adr, self.base.storage[2:])
+            ).Elif(self.enable.storage & (fetched <= started) & (fetched < src_vres),
+                NextValue(index, 0),
+                NextState("FETCH")
+            )
+        )
+        fsm.act("FETCH",
+            bus.cyc.eq(1),
+            bus.stb.eq(1),
+            bus.adr.eq(line_adr + index),
+            bus.sel.eq(0xf),
+            bus.cti.eq(CTI_INCREMENTING),
+            If(burst_end,
+                bus.cti.eq(CTI_END)
+            ),
+            If(bus.ack | bus.err,
+                wr.we.eq(bus.ack),
+                NextValue(index, index + 1),
+                If(last,
+                    NextValue(fetched, fetched + 1),
+                    NextValue(line_adr, line_adr + line_words),
+                    NextState("IDLE")
+                ).Elif(burst_end,
+                    NextState("GAP")
+                )
+            )
+        )
+        # Release the bus between bursts.
+        fsm.act("GAP",
+            NextState("FETCH")
+        )
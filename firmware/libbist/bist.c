@@ -0,0 +1,54 @@
+/*
+ * Main RAM BIST runner for the LiteX BIOS.
+ *
+ * Registered as a BIOS init function: runs the hardware self-test
+ * (cores/bist) over main_ram after the memory initialization, before the
+ * boot sequence, and prints the result and the measured bandwidth.
+ */
+
+#include <stdint.h>
+#include <stdio.h>
+
+#include <bios/init.h>
+#include <generated/csr.h>
+#include <generated/soc.h>
+
+#ifdef CSR_MAIN_RAM_BIST_BASE
+
+#define STATUS_DONE   (1 << CSR_MAIN_RAM_BIST_STATUS_DONE_OFFSET)
+#define STATUS_PASSED (1 << CSR_MAIN_RAM_BIST_STATUS_PASSED_OFFSET)
+
+static uint32_t bandwidth_kib(uint32_t bytes, uint32_t cycles)
+{
+	if (cycles == 0)
+		return 0;
+	return (uint64_t)bytes * CONFIG_CLOCK_FREQUENCY / cycles / 1024;
+}
+
+static void main_ram_bist(void)
+{
+	uint32_t length = main_ram_bist_length_read();
+
+	printf("Main RAM BIST: testing %lu KiB...\n", (unsigned long)(length / 1024));
+	/* Keep the configured pattern, set the start pulse. */
+	main_ram_bist_control_write(main_ram_bist_control_read() |
+		(1 << CSR_MAIN_RAM_BIST_CONTROL_START_OFFSET));
+	while (!(main_ram_bist_status_read() & STATUS_DONE));
+
+	if (main_ram_bist_status_read() & STATUS_PASSED)
+		printf("Main RAM BIST: passed");
+	else
+		printf("Main RAM BIST: \e[1mFAILED\e[0m, %lu errors, first at 0x%08lx "
+			"(expected 0x%08lx, read 0x%08lx)",
+			(unsigned long)main_ram_bist_errors_read(),
+			(unsigned long)main_ram_bist_first_error_addr_read(),
+			(unsigned long)main_ram_bist_first_error_expected_read(),
+			(unsigned long)main_ram_bist_first_error_actual_read());
+	printf(" (write %lu KiB/s, read %lu KiB/s)\n",
+		(unsigned long)bandwidth_kib(length, main_ram_bist_write_cycles_read()),
+		(unsigned long)bandwidth_kib(length, main_ram_bist_read_cycles_read()));
+}
+
+define_init_func(main_ram_bist);
+
+#endif
@@ -0,0 +1,53 @@
+/*
+ * Firmware side of the PC-sampling profiler, see profiler.h.
+ */
+
+#include <irq.h>
+#include <system.h>
+
+#include <generated/csr.h>
+#include <generated/soc.h>
+
+#include "profiler.h"
+
+#if defined(CSR_PROFILER_BASE) && defined(PROFILER_INTERRUPT)
+
+static void profiler_isr(void)
+{
+	/* mepc is the PC the sample event interrupted. */
+	profiler_sample_write(csrr(mepc));
+	profiler_ev_pending_write(profiler_ev_pending_read());
+}
+
+int profiler_start(void)
+{
+	if (irq_attach(PROFILER_INTERRUPT, profiler_isr) < 0)
+		return -1;
+	profiler_ev_pending_write(profiler_ev_pending_read());
+	profiler_ev_enable_write(1);
+	irq_setmask(irq_getmask() | (1 << PROFILER_INTERRUPT));
+	irq_setie(1);
+	profiler_enable_write(1);
+	return 0;
+}
+
+void profiler_stop(void)
+{
+	profiler_enable_write(0);
+	profiler_ev_enable_write(0);
+	irq_setmask(irq_getmask() & ~(1 << PROFILER_INTERRUPT));
+	irq_detach(PROFILER_INTERRUPT);
+}
+
+#else
+
+int profiler_start(void)
+{
+	return -1;
+}
+
+void profiler_stop(void)
+{
+}
+
+#endif
@@ -0,0 +1,21 @@
+/*
+ * Firmware side of the PC-sampling profiler (interrupt source).
+ *
+ * With profiler_source "irq" the sampler only raises its sample event; the
+ * handler installed here records the interrupted PC (mepc) into the ring
+ * buffer. Add profiler.c to the kernel's objects (include path
+ * firmware/profiler) and call profiler_start() once interrupts are set up.
+ * host/profile.py reads the samples back over the stream UART or bridge.
+ */
+
+#ifndef PROFILER_H
+#define PROFILER_H
+
+/* Install the handler, unmask the interrupt and start sampling.
+ * Returns -1 when the SoC has no interrupt-driven profiler. */
+int profiler_start(void);
+
+/* Stop sampling; samples already taken stay in the ring buffer. */
+void profiler_stop(void);
+
+#endif /* PROFILER_H */
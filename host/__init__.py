@@ -0,0 +1,6 @@
+"""Host-side Tools"""
+
+from .csr import CSRMap
+from .bridge import UARTBridge, RemoteSoC
+
+__all__ = ["CSRMap", "UARTBridge", "RemoteSoC"]
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+UART-to-Wishbone Bridge Client
+
+Host side of the UARTBone bridge: batched and pipelined memory access,
+typed CSR access from csr.csv and a bulk loader with CRC32 verification.
+"""
+
+import argparse
+import struct
+import sys
+import time
+import zlib
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from .csr import CSRMap, CSRRegister
+
+# UARTBone commands. A command is cmd, length (words, 1-255) and the
+# 32-bit word address, big-endian, followed by the write data words
+# (big-endian). Reads answer with length big-endian words.
+CMD_WRITE_BURST_INCR = 0x01
+CMD_READ_BURST_INCR  = 0x02
+
+MAX_BURST = 255
+
+# Bytes per command header (cmd, length, address).
+HEADER_SIZE = 6
+
+
+class UARTBridge:
+    """
+    UARTBone client.
+
+    Reads are pipelined: up to window read commands are kept in flight, so
+    the link stays busy instead of idling for one round trip per command.
+    window must stay within the bridge's RX FIFO depth / HEADER_SIZE; the
+    default of 1 suits a bridge without RX FIFO (shared crossover UART).
+    """
+
+    def __init__(self, port, baudrate=1_000_000, window=1, timeout=2.0):
+        import serial
+
+        self.port   = serial.Serial(port, baudrate, timeout=timeout)
+        self.window = window
+
+    def close(self):
+        self.port.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # Word access --------------------------------------------------------------------------------
+
+    def read_many(self, requests: Iterable[Tuple[int, int]]) -> List[List[int]]:
+        """
+        Read several (byte address, word count) ranges in one pipeline.
+
+        Returns one list of words per request.
+        """
+        commands = []  # (request index, address, words)
+        results  = []
+        for n, (addr, length) in enumerate(requests):
+            results.append([])
+            for offset in range(0, length, MAX_BURST):
+                commands.append((n, addr + 4 * offset, min(MAX_BURST, length - offset)))
+
+        sent = 0
+        for received, (n, _, length) in enumerate(commands):
+            # Keep up to window commands in flight.
+            while sent < len(commands) and sent < received + self.window:
+                _, addr, count = commands[sent]
+                self.port.write(self._header(CMD_READ_BURST_INCR, addr, count))
+                sent += 1
+            results[n].extend(self._receive_words(length))
+        return results
+
+    def read(self, addr, length=1) -> List[int]:
+        """Read length words starting at byte address addr."""
+        return self.read_many([(addr, length)])[0]
+
+    def write(self, addr, data: Sequence[int]):
+        """
+        Write words starting at byte address addr.
+
+        Commands are batched into large serial writes; writes have no
+        response, call sync() to wait until they have been executed.
+        """
+        packet = bytearray()
+        for offset in range(0, len(data), MAX_BURST):
+            chunk   = data[offset:offset + MAX_BURST]
+            packet += self._header(CMD_WRITE_BURST_INCR, addr + 4 * offset, len(chunk))
+            packet += struct.pack(f">{len(chunk)}I", *chunk)
+        self.port.write(packet)
+
+    def sync(self, addr):
+        """Wait for previous writes by reading back from addr."""
+        self.read(addr)
+
+    # Byte access --------------------------------------------------------------------------------
+
+    def read_bytes(self, addr, size) -> bytes:
+        """Read size bytes (rounded up to words) from word-aligned addr."""
+        words = self.read(addr, (size + 3) // 4)
+        return struct.pack(f"<{len(words)}I", *words)[:size]
+
+    def write_bytes(self, addr, data: bytes):
+        """Write data (zero-padded to words) to word-aligned addr."""
+        data += bytes(-len(data) % 4)
+        self.write(addr, struct.unpack(f"<{len(data) // 4}I", data))
+
+    def load(self, addr, data: bytes, verify=True, crc32: Optional[Callable[[int, int], int]] = None,
+             chunk_size=64 * 1024, progress=None):
+        """
+        Load data to memory at addr.
+
+        Args:
+            addr: Word-aligned destination byte address.
+            data: Image contents.
+            verify: Check the image after loading.
+            crc32: Optional callback(addr, size) returning the CRC32 the
+                target computes over memory (see RemoteSoC.crc32). Without
+                it verify reads the whole image back, halving throughput.
+            chunk_size: Bytes per progress step.
+            progress: Optional callback(done_bytes, total_bytes).
+
+        Raises:
+            IOError: If verification fails.
+        """
+        total = len(data)
+        for offset in range(0, total, chunk_size):
+            self.write_bytes(addr + offset, data[offset:offset + chunk_size])
+            if progress:
+                progress(min(offset + chunk_size, total), total)
+        if verify and crc32:
+            # The image went out zero-padded to whole words.
+            padded = data + bytes(-total % 4)
+            expected, actual = zlib.crc32(padded), crc32(addr, len(padded))
+            if actual != expected:
+                raise IOError(f"CRC32 mismatch: 0x{actual:08x}, expected 0x{expected:08x}")
+            return
+        if total:
+            self.sync(addr)
+        if verify:
+            readback = self.read_bytes(addr, total)
+            if readback != data:
+                first = next(n for n in range(total) if data[n] != readback[n])
+                raise IOError(f"Read-back mismatch at 0x{addr + first:08x}")
+
+    # Helpers ------------------------------------------------------------------------------------
+
+    @staticmethod
+    def _header(cmd, addr, length):
+        return bytes([cmd, length]) + (addr // 4).to_bytes(4, "big")
+
+    def _receive_words(self, length):
+        raw = self.port.read(4 * length)
+        if len(raw) != 4 * length:
+            raise TimeoutError(f"Bridge timeout: got {len(raw)} of {4 * length} bytes")
+        return list(struct.unpack(f">{length}I", raw))
+
+
+class Register:
+    """Typed access to one CSR register through a bridge."""
+
+    def __init__(self, bridge, csr_map: CSRMap, register: CSRRegister):
+        self.bridge   = bridge
+        self.csr_map  = csr_map
+        self.register = register
+
+    def decode(self, words):
+        """Combine CSR words into one integer."""
+        width = self.csr_map.data_width
+        if not self.csr_map.ordering_big:
+            words = list(reversed(words))
+        value = 0
+        for word in words:
+            value = (value << width) | (word & ((1 << width) - 1))
+        return value
+
+    def encode(self, value):
+        """Split an integer into CSR words."""
+        width = self.csr_map.data_width
+        words = [(value >> (width * n)) & ((1 << width) - 1) for n in range(self.register.size)]
+        words.reverse()
+        if not self.csr_map.ordering_big:
+            words.reverse()
+        return words
+
+    def read(self):
+        return self.decode(self.bridge.read(self.register.address, self.register.size))
+
+    def write(self, value):
+        if not self.register.writable:
+            raise PermissionError(f"CSR {self.register.name} is read-only")
+        self.bridge.write(self.register.address, self.encode(value))
+
+
+class _Registers:
+    """Attribute access to all CSR registers (soc.regs.ctrl_scratch)."""
+
+    def __init__(self, soc):
+        self._soc = soc
+
+    def __getattr__(self, name):
+        return self._soc.reg(name)
+
+    def __dir__(self):
+        return list(self._soc.csr_map.registers)
+
+
+class RemoteSoC:
+    """A running SoC reached through the bridge, described by its csr.csv."""
+
+    def __init__(self, bridge: UARTBridge, csr_map: CSRMap):
+        self.bridge  = bridge
+        self.csr_map = csr_map
+        self.regs    = _Registers(self)
+
+    def reg(self, name) -> Register:
+        return Register(self.bridge, self.csr_map, self.csr_map.register(name))
+
+    def read_regs(self, names) -> dict:
+        """Read several CSR registers in one pipelined batch."""
+        regs  = [self.reg(name) for name in names]
+        words = self.bridge.read_many((r.register.address, r.register.size) for r in regs)
+        return {name: r.decode(w) for name, r, w in zip(names, regs, words)}
+
+    @property
+    def has_crc(self) -> bool:
+        """True if the SoC has the bridge's CRC32 bus master."""
+        return "bridge_crc_result" in self.csr_map.registers
+
+    def crc32(self, addr, size, timeout=10.0) -> int:
+        """
+        CRC32 of size bytes at word-aligned addr, computed on the target.
+
+        The result equals zlib.crc32 of the same bytes; size is rounded
+        down to whole words.
+        """
+        self.reg("bridge_crc_base").write(addr)
+        self.reg("bridge_crc_length").write(size)
+        self.reg("bridge_crc_control").write(1)
+        status   = self.reg("bridge_crc_status")
+        deadline = time.time() + timeout
+        value    = status.read()
+        while value & 1:
+            if time.time() > deadline:
+                raise TimeoutError("Bridge CRC32 timeout")
+            value = status.read()
+        if value & 2:
+            raise IOError(f"Bus error computing CRC32 of 0x{addr:08x}-0x{addr + size:08x}")
+        return self.reg("bridge_crc_result").read()
+
+    def load(self, addr, data: bytes, verify=True, progress=None):
+        """Load data to addr, verified by on-target CRC32 where available."""
+        self.bridge.load(addr, data, verify=verify, crc32=self.crc32 if self.has_crc else None,
+                         progress=progress)
+
+    def resolve(self, location) -> int:
+        """Turn a region name or numeric string into a byte address."""
+        region = self.csr_map.region(location)
+        if region is not None:
+            return region.origin
+        return int(location, 0)
+
+
+def fifo_window(csr_map: CSRMap) -> int:
+    """Read commands the bridge RX FIFO in csr_map can hold (1 without FIFO)."""
+    fifo_depth = csr_map.constants.get("uartbone_rx_fifo_depth") or 0
+    return max(1, fifo_depth // HEADER_SIZE)
+
+
+# Command line -------------------------------------------------------------------------------------
+
+def _progress(done, total):
+    sys.stdout.write(f"\r  {done}/{total} bytes ({100 * done // max(total, 1)}%)")
+    sys.stdout.flush()
+    if done == total:
+        sys.stdout.write("\n")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="UART-to-Wishbone bridge client")
+    parser.add_argument("--port", default="/dev/ttyUSB1", help="Serial port")
+    parser.add_argument("--baudrate", type=int, default=1_000_000, help="Bridge baud rate")
+    parser.add_argument("--window", type=int, default=None,
+        help="Read commands in flight (default: from the bridge RX FIFO in csr.csv, else 1)")
+    parser.add_argument("--csr-csv", default="build/tang_nano_9k/csr.csv", help="CSR map")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("load", help="Load an image to memory")
+    p.add_argument("file")
+    p.add_argument("address", nargs="?", default="main_ram", help="Address or region name")
+    p.add_argument("--no-verify", action="store_true", help="Skip verification")
+
+    p = commands.add_parser("read", help="Read memory words")
+    p.add_argument("address")
+    p.add_argument("length", nargs="?", type=int, default=1)
+
+    p = commands.add_parser("write", help="Write memory words")
+    p.add_argument("address")
+    p.add_argument("values", nargs="+", type=lambda x: int(x, 0))
+
+    p = commands.add_parser("csr", help="Dump all CSRs, or read/write one")
+    p.add_argument("name", nargs="?")
+    p.add_argument("value", nargs="?", type=lambda x: int(x, 0))
+
+    args = parser.parse_args()
+
+    csr_map = CSRMap.from_csv(args.csr_csv)
+    window  = args.window if args.window is not None else fifo_window(csr_map)
+    with UARTBridge(args.port, args.baudrate, window=window) as bridge:
+        soc = RemoteSoC(bridge, csr_map)
+
+        if args.command == "load":
+            with open(args.file, "rb") as f:
+                data = f.read()
+            addr  = soc.resolve(args.address)
+            start = time.time()
+            print(f"Loading {args.file} ({len(data)} bytes) to 0x{addr:08x}...")
+            soc.load(addr, data, verify=not args.no_verify, progress=_progress)
+            elapsed = time.time() - start
+            method  = "CRC32" if soc.has_crc else "read-back"
+            print(f"Done in {elapsed:.2f}s ({len(data) / max(elapsed, 1e-9) / 1024:.1f} KiB/s)"
+                  + ("" if args.no_verify else f", verified by {method}"))
+        elif args.command == "read":
+            addr = soc.resolve(args.address)
+            for n, word in enumerate(bridge.read(addr, args.length)):
+                print(f"0x{addr + 4 * n:08x}: 0x{word:08x}")
+        elif args.command == "write":
+            addr = soc.resolve(args.address)
+            bridge.write(addr, args.values)
+            bridge.sync(addr)
+        elif args.name is None:
+            for name, value in soc.read_regs(list(csr_map.registers)).items():
+                print(f"{name:<40} 0x{value:x}")
+        elif args.value is None:
+            print(f"0x{soc.reg(args.name).read():x}")
+        else:
+            soc.reg(args.name).write(args.value)
+
+
+if __name__ == "__main__":
+    main()
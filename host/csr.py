@@ -0,0 +1,93 @@
+"""CSR Map (parsed from the builder's csr.csv)"""
+
+import csv
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class CSRRegister:
+    """A CSR register: size is in CSR words, mode is "rw" or "ro"."""
+
+    name: str
+    address: int
+    size: int
+    mode: str
+
+    @property
+    def writable(self) -> bool:
+        return self.mode == "rw"
+
+
+@dataclass(frozen=True)
+class MemoryRegion:
+    """A bus memory region."""
+
+    name: str
+    origin: int
+    size: int
+    mode: str
+
+
+@dataclass
+class CSRMap:
+    """
+    Registers, CSR bases, constants and memory regions of a built SoC.
+
+    Values are typed: addresses and sizes are ints, constants are ints where
+    they parse as such, None for flag constants and str otherwise.
+    """
+
+    registers: Dict[str, CSRRegister] = field(default_factory=dict)
+    bases: Dict[str, int] = field(default_factory=dict)
+    constants: Dict[str, object] = field(default_factory=dict)
+    regions: Dict[str, MemoryRegion] = field(default_factory=dict)
+
+    @classmethod
+    def from_csv(cls, path) -> "CSRMap":
+        """Parse a LiteX csr.csv file."""
+        csr_map = cls()
+        with open(path, newline="") as f:
+            for row in csv.reader(f):
+                if not row or row[0].startswith("#") or row[0] == "type":
+                    continue
+                kind, name, value = row[0], row[1], row[2]
+                size  = row[3] if len(row) > 3 else ""
+                flags = row[4] if len(row) > 4 else ""
+                if kind == "csr_base":
+                    csr_map.bases[name] = int(value, 0)
+                elif kind == "csr_register":
+                    csr_map.registers[name] = CSRRegister(name, int(value, 0), int(size), flags)
+                elif kind == "constant":
+                    csr_map.constants[name] = _parse_constant(value)
+                elif kind == "memory_region":
+                    csr_map.regions[name] = MemoryRegion(name, int(value, 0), int(size), flags)
+        return csr_map
+
+    @property
+    def data_width(self) -> int:
+        """CSR data width in bits."""
+        return self.constants.get("config_csr_data_width", 32)
+
+    @property
+    def ordering_big(self) -> bool:
+        """True if the first CSR word holds the most significant bits."""
+        return "config_csr_ordering_little" not in self.constants
+
+    def register(self, name) -> CSRRegister:
+        try:
+            return self.registers[name]
+        except KeyError:
+            raise KeyError(f"Unknown CSR register: {name}") from None
+
+    def region(self, name) -> Optional[MemoryRegion]:
+        return self.regions.get(name)
+
+
+def _parse_constant(value):
+    if value == "None":
+        return None
+    try:
+        return int(value, 0)
+    except ValueError:
+        return value
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+PC-Sampling Profiler Client
+
+Captures samples from the profiler peripheral (UART stream or CSR readout
+through the bridge), symbolizes them against the firmware ELF and prints a
+flat profile or folded stacks for flame graph tools.
+"""
+
+import argparse
+import bisect
+import struct
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Iterable, List, Tuple
+
+# Stream framing, see cores/profiler/sampler.py.
+SYNC_BYTE  = 0xa5
+FRAME_SIZE = 5
+
+UNKNOWN = "[unknown]"
+
+
+# Capture ------------------------------------------------------------------------------------------
+
+def parse_stream(data: bytes) -> List[int]:
+    """
+    Decode SYNC_BYTE + 4-byte LE frames.
+
+    Bytes before the first sync and after a lost sync are skipped, so a
+    capture started mid-frame resynchronizes.
+    """
+    samples = []
+    n = 0
+    while n + FRAME_SIZE <= len(data):
+        if data[n] != SYNC_BYTE:
+            n += 1
+            continue
+        samples.append(struct.unpack_from("<I", data, n + 1)[0])
+        n += FRAME_SIZE
+    return samples
+
+
+def capture_uart(port, baudrate, duration) -> List[int]:
+    """Read the sample stream from a serial port for duration seconds."""
+    import serial
+
+    data = bytearray()
+    with serial.Serial(port, baudrate, timeout=0.1) as ser:
+        end = time.time() + duration
+        while time.time() < end:
+            data += ser.read(4096)
+    return parse_stream(bytes(data))
+
+
+def capture_csr(soc, duration, name="profiler") -> List[int]:
+    """
+    Drain the ring buffer through the data CSR for duration seconds.
+
+    Each data read pops a sample, so the samples counted by level are read
+    as one pipelined batch of data reads.
+    """
+    level = soc.reg(f"{name}_level")
+    data  = soc.reg(f"{name}_data")
+    read  = (data.register.address, data.register.size)
+
+    samples = []
+    end = time.time() + duration
+    while time.time() < end:
+        batch = soc.bridge.read_many([read] * level.read())
+        samples.extend(data.decode(words) for words in batch)
+    return samples
+
+
+def save_samples(path, samples: Iterable[int]):
+    with open(path, "w") as f:
+        for pc in samples:
+            f.write(f"0x{pc:08x}\n")
+
+
+def load_samples(path) -> List[int]:
+    """Load a saved sample list, or a raw stream capture (.bin)."""
+    if path.endswith(".bin"):
+        with open(path, "rb") as f:
+            return parse_stream(f.read())
+    with open(path) as f:
+        return [int(line, 0) for line in f if line.strip()]
+
+
+# Symbolization ------------------------------------------------------------------------------------
+
+class SymbolTable:
+    """Function symbols of an ELF, looked up by address."""
+
+    def __init__(self, symbols: List[Tuple[int, int, str]]):
+        self.symbols   = sorted(symbols)
+        self.addresses = [s[0] for s in self.symbols]
+
+    @classmethod
+    def from_elf(cls, elf, nm="riscv64-unknown-elf-nm") -> "SymbolTable":
+        """Read function symbols with nm (sizes are used where present)."""
+        output = subprocess.run(
+            [nm, "--print-size", "--defined-only", "--demangle", elf],
+            check=True, capture_output=True, text=True
+        ).stdout
+        symbols = []
+        for line in output.splitlines():
+            fields = line.split(maxsplit=3)
+            if len(fields) == 4 and fields[2] in "tTwW":
+                symbols.append((int(fields[0], 16), int(fields[1], 16), fields[3]))
+            elif len(fields) == 3 and fields[1] in "tTwW":
+                symbols.append((int(fields[0], 16), 0, fields[2]))
+        return cls(symbols)
+
+    def lookup(self, pc) -> str:
+        n = bisect.bisect_right(self.addresses, pc) - 1
+        if n < 0:
+            return UNKNOWN
+        addr, size, name = self.symbols[n]
+        if size and pc >= addr + size:
+            return UNKNOWN
+        return name
+
+
+# Reports ------------------------------------------------------------------------------------------
+
+def flat_profile(samples: List[int], symbols: SymbolTable, top=30) -> str:
+    """Samples per function, hottest first."""
+    counts = Counter(symbols.lookup(pc) for pc in samples)
+    total  = max(len(samples), 1)
+    lines  = [f"{len(samples)} samples", f"{'%':>7} {'samples':>9}  function"]
+    for name, count in counts.most_common(top):
+        lines.append(f"{100 * count / total:6.2f}% {count:9}  {name}")
+    return "\n".join(lines)
+
+
+def folded(samples: List[int], symbols: SymbolTable, root="firmware") -> str:
+    """
+    Folded stacks (flamegraph.pl / speedscope input).
+
+    Only the sampled PC is known, so stacks are root;function.
+    """
+    counts = Counter(symbols.lookup(pc) for pc in samples)
+    return "\n".join(f"{root};{name} {count}" for name, count in counts.most_common())
+
+
+# Command line -------------------------------------------------------------------------------------
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="PC-sampling profiler client")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("capture", help="Capture samples to a file")
+    p.add_argument("output", help="Sample file")
+    p.add_argument("--duration", type=float, default=10.0, help="Capture time in seconds")
+    p.add_argument("--port", default="/dev/ttyUSB1", help="Serial port")
+    p.add_argument("--baudrate", type=int, default=1_000_000, help="Stream/bridge baud rate")
+    p.add_argument("--bridge", action="store_true", help="Read through the UART bridge CSRs")
+    p.add_argument("--csr-csv", default="build/tang_nano_9k/csr.csv", help="CSR map (--bridge)")
+
+    p = commands.add_parser("report", help="Symbolize samples")
+    p.add_argument("samples", help="Sample file (.bin for raw stream captures)")
+    p.add_argument("elf", help="Firmware ELF")
+    p.add_argument("--nm", default="riscv64-unknown-elf-nm", help="nm executable")
+    p.add_argument("--top", type=int, default=30, help="Functions to list")
+    p.add_argument("--folded", action="store_true", help="Print folded stacks instead")
+
+    args = parser.parse_args()
+
+    if args.command == "capture":
+        print(f"Capturing for {args.duration:.1f}s...", file=sys.stderr)
+        if args.bridge:
+            from .bridge import UARTBridge, RemoteSoC, fifo_window
+            from .csr import CSRMap
+
+            csr_map = CSRMap.from_csv(args.csr_csv)
+            with UARTBridge(args.port, args.baudrate, window=fifo_window(csr_map)) as bridge:
+                samples = capture_csr(RemoteSoC(bridge, csr_map), args.duration)
+        else:
+            samples = capture_uart(args.port, args.baudrate, args.duration)
+        save_samples(args.output, samples)
+        print(f"{len(samples)} samples written to {args.output}", file=sys.stderr)
+    else:
+        samples = load_samples(args.samples)
+        symbols = SymbolTable.from_elf(args.elf, nm=args.nm)
+        if args.folded:
+            print(folded(samples, symbols))
+        else:
+            print(flat_profile(samples, symbols, top=args.top))
+
+
+if __name__ == "__main__":
+    main()
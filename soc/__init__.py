@@ -3,12 +3,13 @@ RISC-V SoC Package
 Modular SoC builder for FPGA targets
 """
 
-from .config import SoCConfig
+from .config import SoCConfig, ClockSpec
 from .base import BaseSoC
 from .builder import build_soc
 
 __all__ = [
     "SoCConfig", 
+    "ClockSpec",
     "BaseSoC",
     "build_soc"
 ]
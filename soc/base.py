@@ -4,7 +4,31 @@ from litex.soc.integration.soc_core import SoCCore
 
 from .clocking import ClockDomainGenerator
 from .config import SoCConfig
+from .memory import add_fast_ram
+from .timer import add_cycle_timer
 from boards import get_board
+from cores.dma import DMAEngine
+from cores.profiler import PCSampler, FetchAddressTap
+from cores.uart import BufferedUARTBone, BusCRC32
+
+
+def configure_vexriscv_smp(config: SoCConfig):
+    """
+    Select the VexRiscv SMP cluster for config (harts, L1 cache sizes).
+
+    The cluster netlist is taken from pythondata-cpu-vexriscv_smp; a
+    combination that is not pre-generated there is generated with SBT.
+    Harts share main memory through the SoC bus with coherent data caches,
+    CLINT and PLIC are part of the cluster.
+    """
+    from litex.soc.cores.cpu.vexriscv_smp import VexRiscvSMP
+
+    VexRiscvSMP.cpu_count    = config.cpu_count
+    VexRiscvSMP.icache_size  = config.cpu_icache_size
+    VexRiscvSMP.dcache_size  = config.cpu_dcache_size
+    VexRiscvSMP.icache_ways  = 1
+    VexRiscvSMP.dcache_ways  = 1
+    VexRiscvSMP.generate_cluster_name()
 
 
 class BaseSoC(SoCCore):
@@ -12,11 +36,17 @@ class BaseSoC(SoCCore):
     Base RISC-V SoC
 
     Integrates:
-    - CPU (VexRiscv by default)
+    - CPU (VexRiscv by default, VexRiscv SMP for multi-hart)
     - Memory (integrated + optional external)
     - Board-specific peripherals
     """
 
+    mem_map = {
+        **SoCCore.mem_map,
+        "fast_ram":    0x20000000,
+        "cycle_timer": 0xf1000000,
+    }
+
     def __init__(self, config: SoCConfig):
         """
         Initialize SoC
@@ -37,8 +67,18 @@ class BaseSoC(SoCCore):
             sys_clk_freq=config.sys_clk_freq,
             input_clk_name=getattr(board, "input_clk_name", platform.default_clk_name),
             input_clk_freq=getattr(board, "input_clk_freq", config.sys_clk_freq),
+            clocks={**config.clocks, **board.extra_clocks(config)},
         )
 
+        # VexRiscv SMP is configured through class attributes before elaboration
+        if config.cpu_type == "vexriscv_smp":
+            configure_vexriscv_smp(config)
+
+        # Console UART; a bridge on the same pads turns it into a crossover UART
+        uart_name = config.uart_name
+        if config.uartbone_name and config.uartbone_name == config.uart_name:
+            uart_name = "crossover+uartbone"
+
         # Initialize SoC Core
         SoCCore.__init__(
             self,
@@ -49,6 +89,9 @@ class BaseSoC(SoCCore):
             cpu_reset_address=config.cpu_reset_address,
             integrated_rom_size=config.integrated_rom_size,
             integrated_sram_size=config.integrated_sram_size,
+            uart_name=uart_name,
+            uart_baudrate=config.uart_baudrate,
+            uart_fifo_depth=config.uart_fifo_depth,
             ident=f"RISC-V SoC on {board.name}",
             ident_version=True,
         )
@@ -57,5 +100,53 @@ class BaseSoC(SoCCore):
         if not self.integrated_main_ram_size and config.with_external_ram:
             board.add_main_memory(self, platform, config)
 
+        # Add memory-mapped 64-bit cycle timer
+        if config.with_cycle_timer:
+            add_cycle_timer(self, config)
+
+        # Add UART-to-Wishbone bridge on its own pads
+        if config.uartbone_name and uart_name != "crossover+uartbone":
+            self.uartbone = BufferedUARTBone(
+                pads=platform.request(config.uartbone_name),
+                clk_freq=config.sys_clk_freq,
+                baudrate=config.bridge_baudrate,
+            )
+            self.bus.add_master(name="uartbone", master=self.uartbone.wishbone)
+            # Lets host tools size their read pipeline to the RX FIFO
+            self.add_constant("UARTBONE_RX_FIFO_DEPTH", self.uartbone.fifo_depth)
+
+        # Add CRC32 bus master so the host verifies loads without reading them back
+        if config.uartbone_name:
+            self.bridge_crc = BusCRC32()
+            self.bus.add_master(name="bridge_crc", master=self.bridge_crc.bus)
+
+        # Add DMA engine as second bus master
+        if config.with_dma:
+            self.dma = DMAEngine(burst_length=config.dma_burst_length)
+            self.bus.add_master(name="dma", master=self.dma.bus)
+            self.irq.add("dma", use_loc_if_exists=True)
+
+        # Add PC-sampling profiler (firmware ISR samples mepc, or a hardware tap)
+        if config.with_profiler:
+            pc = None
+            if config.profiler_source == "ibus":
+                ibus = getattr(self.cpu, "ibus", None)
+                if ibus is None:
+                    raise ValueError(f"{config.cpu_type} has no instruction bus for the profiler to tap")
+                self.profiler_tap = FetchAddressTap(ibus)
+                pc = self.profiler_tap.pc
+            self.profiler = PCSampler(
+                clk_freq=config.sys_clk_freq,
+                pc=pc,
+                pads=platform.request(config.profiler_uart_name) if config.profiler_uart_name else None,
+                baudrate=config.profiler_baudrate,
+                sample_rate=config.profiler_sample_rate,
+            )
+            if pc is None:
+                self.irq.add("profiler", use_loc_if_exists=True)
+
         # Add all board-specific peripherals (board decides what it can provide)
         board.add_peripherals(self, platform, config)
+
+        # Add fast on-chip RAM from the BSRAM left over
+        add_fast_ram(self, board, config)
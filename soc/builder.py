@@ -11,10 +11,16 @@ from pathlib import Path
 
 from litex.soc.integration.builder import Builder
 
-from .config import SoCConfig
+from .config import SoCConfig, ClockSpec
 from .base import BaseSoC
+from .memory import add_bist_software, write_fast_ram_files
+from .resources import estimate_resources
+from .timer import write_cycle_timer_header
+from .flash import FlashRegion, DifferentialFlasher
+from boards import get_board
 
-def build_soc(config: SoCConfig, build=False, flash=False, load=False):
+def build_soc(config: SoCConfig, build=False, flash=False, load=False,
+              resource_check="warn", flash_mode="readback", verify=False):
     """
     Build SoC with given configuration
     
@@ -23,13 +29,28 @@ def build_soc(config: SoCConfig, build=False, flash=False, load=False):
         build: Whether to build bitstream
         flash: Whether to flash to board
         load: Whether to load to SRAM
+        resource_check: Over-budget estimate before building: "warn",
+            "error" (refuse; the estimate is not calibrated against
+            synthesis, so it can reject designs that fit) or "off"
+        flash_mode: "readback" (write the external flash sectors that
+            differ from the board, internal flash in full), "diff" (skip
+            regions unchanged since this host's last flash) or "full"
+        verify: Whether to compare flash against the build without writing
     
     Returns:
         Builder instance
+    
+    Raises:
+        ValueError: If the resource estimate exceeds the board and
+            resource_check is "error", or if verify finds a mismatch.
     """
     # Create SoC
     soc = BaseSoC(config)
     
+    # Estimate resources before spending minutes in the toolchain
+    if build and resource_check != "off":
+        check_resources(soc, config, fatal=resource_check == "error")
+    
     # Create builder
     builder = Builder(
         soc,
@@ -37,26 +58,46 @@ def build_soc(config: SoCConfig, build=False, flash=False, load=False):
         csr_csv=f"{config.output_path}/csr.csv"
     )
     
+    # BIOS main RAM self-test
+    add_bist_software(soc, builder)
+    
     # Build if requested
     if build:
+        # Linker fragment/headers for fast_ram and the cycle timer (only for
+        # the configuration being built: flash/load runs must not touch a
+        # build's files)
+        write_fast_ram_files(soc, builder.generated_dir)
+        write_cycle_timer_header(soc, builder.generated_dir)
         print(f"Building SoC for {config.board_name}...")
-        builder.build()
+        builder.build(**get_board(config.board_name).build_kwargs(soc, config))
         print(f"\nBuild complete! Output in {config.output_path}/")
         print(f"CSR map: {config.output_path}/csr.csv")
     
-    # Flash if requested
-    if flash:
-        print("Flashing to board...")
-        prog = soc.platform.create_programmer()
-        
-        # Flash bitstream
-        bitstream = builder.get_bitstream_filename(mode="flash", ext=".fs")
-        prog.flash(0, bitstream)
-        
-        # Flash BIOS
-        bios = builder.get_bios_filename()
-        prog.flash(0x40000, bios, external=True)
-        print("Flash complete!")
+    # Flash (bitstream to internal flash, BIOS to external flash) if requested
+    if flash or verify:
+        regions = [
+            FlashRegion("bitstream", 0, builder.get_bitstream_filename(mode="flash", ext=".fs")),
+            FlashRegion("bios", 0x40000, builder.get_bios_filename(), external=True),
+        ]
+        flasher = DifferentialFlasher(
+            soc.platform.create_programmer(),
+            manifest_path=f"{config.output_path}/flash_manifest.json",
+            readback=flash_mode == "readback",
+            force=flash_mode == "full",
+        )
+        if flash:
+            print("Flashing to board...")
+            flasher.flash(regions)
+            print("Flash complete!")
+        if verify:
+            print("Verifying flash...")
+            ok, unverified = flasher.verify(regions)
+            if not ok:
+                raise ValueError("Flash contents differ from the build")
+            if unverified:
+                print(f"Flash verified except {', '.join(unverified)} (not readable)")
+            else:
+                print("Flash verified!")
     
     # Load to SRAM if requested
     if load:
@@ -68,6 +109,33 @@ def build_soc(config: SoCConfig, build=False, flash=False, load=False):
     
     return builder
 
+def check_resources(soc, config, fatal=True):
+    """
+    Print the resource estimate of soc and check it against the board.
+    
+    Raises:
+        ValueError: If over budget and fatal.
+    """
+    estimate = estimate_resources(soc, get_board(config.board_name))
+    print("Estimated resources:")
+    print(estimate.report())
+    over = estimate.over_budget()
+    if over:
+        message = f"Configuration exceeds the board's {', '.join(r.upper() for r in over)} (estimate)"
+        if fatal:
+            raise ValueError(message + "; use --resource-check=warn to build anyway")
+        print(f"Warning: {message}")
+    return estimate
+
+def parse_clock(arg):
+    """Parse a NAME=FREQ[@PHASE] clock argument into (name, ClockSpec)."""
+    try:
+        name, spec = arg.split("=", 1)
+        freq, _, phase = spec.partition("@")
+        return name, ClockSpec(freq=float(freq), phase=float(phase or 0))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid clock specification: {arg}")
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -81,37 +149,260 @@ def main():
         help="Target board (default: tang_nano_9k)"
     )
     
+    # CPU
+    parser.add_argument(
+        "--cpu-type",
+        default=SoCConfig.cpu_type,
+        help="CPU type, vexriscv_smp for multi-hart (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--cpu-variant",
+        default=SoCConfig.cpu_variant,
+        help="CPU variant (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--cpu-count",
+        type=int,
+        default=SoCConfig.cpu_count,
+        help="Harts, vexriscv_smp only (default: %(default)s)"
+    )
+    
     # Memory configuration
     parser.add_argument(
         "--no-external-ram",
         action="store_true",
         help="Disable external RAM (use SRAM only)"
     )
+    parser.add_argument(
+        "--with-bist",
+        action="store_true",
+        help="Run a hardware self-test of external RAM from the BIOS"
+    )
+    parser.add_argument(
+        "--integrated-rom-size",
+        type=lambda x: int(x, 0),
+        default=SoCConfig.integrated_rom_size,
+        help="Integrated ROM size in bytes"
+    )
+    parser.add_argument(
+        "--fast-ram-size",
+        type=lambda x: int(x, 0),
+        default=None,
+        help="Fast on-chip RAM size in bytes (default: auto, 0 to disable)"
+    )
+    
+    # DMA
+    parser.add_argument(
+        "--with-dma",
+        action="store_true",
+        help="Add memcpy/memset DMA engine"
+    )
+    
+    # UART
+    parser.add_argument(
+        "--uart-baudrate",
+        type=int,
+        default=SoCConfig.uart_baudrate,
+        help="Console UART baud rate (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--uart-name",
+        default=SoCConfig.uart_name,
+        help="Console UART pads (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--uart1-pads",
+        default=SoCConfig.uart1_pads,
+        help="Secondary UART pads (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--uart1-baudrate",
+        type=int,
+        default=SoCConfig.uart1_baudrate,
+        help="Secondary UART baud rate (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--uart1-fifo-depth",
+        type=int,
+        default=SoCConfig.uart1_fifo_depth,
+        help="Secondary UART FIFO depth (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--uart1-with-dma",
+        action="store_true",
+        help="Secondary UART with RX/TX DMA"
+    )
+    parser.add_argument(
+        "--uart1-dma-fifo-depth",
+        type=int,
+        default=SoCConfig.uart1_dma_fifo_depth,
+        help="Secondary UART FIFO depth with DMA (default: %(default)s)"
+    )
+    
+    parser.add_argument(
+        "--uartbone-name",
+        default=SoCConfig.uartbone_name,
+        help="UART-to-Wishbone bridge pads, 'serial' shares the console (default: disabled)"
+    )
+    parser.add_argument(
+        "--uartbone-baudrate",
+        type=int,
+        default=SoCConfig.uartbone_baudrate,
+        help="UART-to-Wishbone bridge baud rate on its own pads (default: 1000000; "
+             "a bridge sharing the console uses --uart-baudrate)"
+    )
+    
+    # Cycle timer
+    parser.add_argument(
+        "--with-cycle-timer",
+        action="store_true",
+        help="Add the memory-mapped 64-bit cycle timer"
+    )
+    parser.add_argument(
+        "--cycle-timer-channels",
+        type=int,
+        default=SoCConfig.cycle_timer_channels,
+        help="Cycle timer compare channels (default: %(default)s)"
+    )
+    
+    # Profiler
+    parser.add_argument(
+        "--with-profiler",
+        action="store_true",
+        help="Add PC-sampling profiler"
+    )
+    parser.add_argument(
+        "--profiler-uart-name",
+        default=SoCConfig.profiler_uart_name,
+        help="Pads to stream profiler samples on (default: CSR readout)"
+    )
+    parser.add_argument(
+        "--profiler-source",
+        choices=["irq", "ibus"],
+        default=SoCConfig.profiler_source,
+        help="irq: firmware ISR records mepc, ibus: tap fetch addresses (vexriscv minimal) (default: %(default)s)"
+    )
+    
+    # Video
+    parser.add_argument(
+        "--with-video",
+        action="store_true",
+        help="Add HDMI framebuffer output"
+    )
+    parser.add_argument(
+        "--video-timings",
+        default=SoCConfig.video_timings,
+        help="Video timings (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--video-scale",
+        type=int,
+        default=SoCConfig.video_scale,
+        help="Framebuffer pixel replication factor (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--video-format",
+        choices=["rgb332", "rgb565", "rgb888"],
+        default=SoCConfig.video_format,
+        help="Framebuffer pixel format (default: %(default)s)"
+    )
+    
+    # Simulation
+    parser.add_argument(
+        "--sim-ram-init",
+        default=SoCConfig.sim_ram_init,
+        help="Image preloaded into main RAM and booted (sim board only)"
+    )
     
     # Actions
     parser.add_argument("--build", action="store_true", help="Build bitstream")
+    parser.add_argument("--estimate", action="store_true", help="Print resource estimate and exit")
+    parser.add_argument(
+        "--resource-check",
+        choices=["error", "warn", "off"],
+        default="warn",
+        help="Over-budget resource estimate before building (default: %(default)s)"
+    )
     parser.add_argument("--flash", action="store_true", help="Flash to board")
     parser.add_argument("--load", action="store_true", help="Load to SRAM")
+    parser.add_argument(
+        "--flash-mode",
+        choices=["readback", "diff", "full"],
+        default="readback",
+        help="readback: write only external flash sectors that differ from the board "
+             "(internal flash in full), diff: skip regions unchanged since this host's "
+             "last flash (one board only), full: rewrite all (default: %(default)s)"
+    )
+    parser.add_argument("--verify-flash", action="store_true", help="Compare flash with the build, no writes")
     
     # Configuration
     parser.add_argument("--sys-clk-freq", type=float, default=27e6, help="System clock frequency")
+    parser.add_argument(
+        "--clock",
+        action="append",
+        default=[],
+        type=parse_clock,
+        metavar="NAME=FREQ[@PHASE]",
+        help="Additional clock domain, e.g. mem=54e6 or video=25.2e6@90 (repeatable)"
+    )
     
     args = parser.parse_args()
     
     # Create configuration
     config = SoCConfig(
         board_name=args.board,
+        cpu_type=args.cpu_type,
+        cpu_variant=args.cpu_variant,
+        cpu_count=args.cpu_count,
         sys_clk_freq=args.sys_clk_freq,
-        with_external_ram=not args.no_external_ram
+        clocks=dict(args.clock),
+        with_external_ram=not args.no_external_ram,
+        with_bist=args.with_bist,
+        integrated_rom_size=args.integrated_rom_size,
+        fast_ram_size=args.fast_ram_size,
+        with_dma=args.with_dma,
+        uart_name=args.uart_name,
+        uart_baudrate=args.uart_baudrate,
+        uart1_pads=args.uart1_pads,
+        uart1_baudrate=args.uart1_baudrate,
+        uart1_fifo_depth=args.uart1_fifo_depth,
+        uart1_with_dma=args.uart1_with_dma,
+        uart1_dma_fifo_depth=args.uart1_dma_fifo_depth,
+        uartbone_name=args.uartbone_name,
+        uartbone_baudrate=args.uartbone_baudrate,
+        with_cycle_timer=args.with_cycle_timer,
+        cycle_timer_channels=args.cycle_timer_channels,
+        with_profiler=args.with_profiler,
+        profiler_uart_name=args.profiler_uart_name,
+        profiler_source=args.profiler_source,
+        want_video=args.with_video,
+        video_timings=args.video_timings,
+        video_scale=args.video_scale,
+        video_format=args.video_format,
+        sim_ram_init=args.sim_ram_init
     )
     
+    # Estimate only
+    if args.estimate:
+        try:
+            check_resources(BaseSoC(config), config, fatal=args.resource_check == "error")
+        except ValueError as e:
+            sys.exit(f"Error: {e}")
+        return
+    
     # Build SoC
-    build_soc(
-        config=config,
-        build=args.build,
-        flash=args.flash,
-        load=args.load
-    )
+    try:
+        build_soc(
+            config=config,
+            build=args.build,
+            flash=args.flash,
+            load=args.load,
+            resource_check=args.resource_check,
+            flash_mode=args.flash_mode,
+            verify=args.verify_flash
+        )
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
 
 if __name__ == "__main__":
     main()
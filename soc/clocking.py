@@ -1,49 +1,202 @@
 from migen import *
+from migen.genlib.resetsync import AsyncResetSynchronizer
 from litex.gen import LiteXModule
 from litex.soc.cores.clock.gowin_gw1n import GW1NPLL
+from litex.soc.cores.clock.gowin_gw2a import GW2APLL
+from litex.soc.cores.clock.gowin_gw5a import GW5APLL
+from litex.build.sim import SimPlatform
+
+from .config import ClockSpec
+from .pll import get_pll_family, search_pll, solution_from_config
+
+# Divide ratios supported by the Gowin CLKDIV primitive.
+CLKDIV_RATIOS = (2, 3.5, 4, 5)
 
 
 class ClockDomainGenerator(LiteXModule):
-    """Clock and Reset Generator."""
+    """
+    Clock and Reset Generator.
+
+    Always creates the sys domain; every entry of clocks creates an extra
+    cd_<name> domain. Clocks are generated from the fastest to the slowest:
+    a domain whose frequency is a CLKDIV ratio of a phase-0 PLL output (and
+    has no phase offset itself) is derived through CLKDIV, otherwise it gets
+    a PLL output (rPLL: CLKOUT, CLKOUTP, CLKOUTD or CLKOUTD3). The achieved frequencies (as configured by the LiteX PLL
+    wrappers) are collected in self.achieved and self.report.
+    """
 
     def __init__(self, platform, sys_clk_freq,
-                 input_clk_name="clk27", input_clk_freq=27e6):
-        self.rst   = Signal()
+                 input_clk_name="clk27", input_clk_freq=27e6, clocks=None):
+        self.rst    = Signal()
         self.cd_sys = ClockDomain()
 
+        self.clocks = {"sys": ClockSpec(sys_clk_freq)}
+        self.clocks.update(clocks or {})
+        for name in self.clocks:
+            if name != "sys":
+                setattr(self, f"cd_{name}", ClockDomain(name))
+
+        self.report   = []
+        self.achieved = {}  # name -> Hz
+
         # Get platform resources
-        clk_in    = platform.request(input_clk_name)
-        reset_btn = platform.request("user_btn", 0)
+        clk_in = platform.request(input_clk_name)
 
         # Detect platform type and create appropriate PLL / clocking
-        if hasattr(platform, "devicename"):  # Gowin
-            self._create_gowin_pll(platform, clk_in, reset_btn,
-                                   input_clk_freq, sys_clk_freq)
+        if isinstance(platform, SimPlatform):
+            self._create_sim_clocks(platform, clk_in)
+        elif hasattr(platform, "devicename"):  # Gowin
+            reset_btn = platform.request("user_btn", 0)
+            self._create_gowin_clocks(platform, clk_in, reset_btn, input_clk_freq)
         else:
             raise NotImplementedError(f"Platform {type(platform)} not supported")
 
-    def _create_gowin_pll(self, platform, clk_in, reset_btn,
-                          input_freq, output_freq):
-        """Create Gowin-specific PLL or simple buffer for unsupported devices."""
+        for line in self.report:
+            print(line)
+
+    def _create_sim_clocks(self, platform, clk_in):
+        """Simulation: every domain runs from the simulator's clock."""
+        sys_rst = platform.request("sys_rst")
+        for name, spec in self.clocks.items():
+            cd = getattr(self, f"cd_{name}")
+            self.comb += cd.clk.eq(clk_in)
+            self.specials += AsyncResetSynchronizer(cd, sys_rst | self.rst)
+            self.achieved[name] = spec.freq
+        self.report.append("sim: all clocks driven by the simulator clock")
+
+    def _create_gowin_clocks(self, platform, clk_in, reset_btn, input_freq):
+        """Create Gowin PLLs/CLKDIVs, or a pass-through for parts without PLL support."""
         dev = getattr(platform, "device", "")
+        family, npll = get_pll_family(platform.devicename or dev)
+        if family is None:
+            family, npll = get_pll_family(dev)
+
+        if family is None:
+            # No supported PLL: only a pass-through of the input clock is possible.
+            for name, spec in self.clocks.items():
+                if abs(spec.freq - input_freq) / spec.freq > spec.margin:
+                    raise ValueError(
+                        f"{dev}: no supported PLL, cannot generate {name} at "
+                        f"{spec.freq / 1e6:.3f} MHz from {input_freq / 1e6:.3f} MHz input"
+                    )
+                cd = getattr(self, f"cd_{name}")
+                self.comb += cd.clk.eq(clk_in)
+                self.specials += AsyncResetSynchronizer(cd, ~reset_btn | self.rst)
+                self.achieved[name] = input_freq
+            self.report.append(f"{dev}: no supported PLL, all clocks pass through clk_in")
+            return
 
-        if dev.startswith("GW1N") or dev.startswith("GW1NR"):
-            # Use GW1N PLL for Tang Nano 9K and other GW1N/R parts.
-            self.pll = GW1NPLL(
-                devicename=platform.devicename,
-                device=platform.device,
+        plls = []  # [(pll, [names])]
+        generated = {}  # name -> ClockSpec (requested), PLL outputs only
+        derived   = {}  # name -> (parent, CLKDIV ratio)
+        for name, spec in sorted(self.clocks.items(), key=lambda kv: -kv[1].freq):
+            cd = getattr(self, f"cd_{name}")
+
+            # Derive from an already generated clock through CLKDIV.
+            parent = self._find_clkdiv_parent(spec, generated)
+            if parent is not None:
+                ratio = generated[parent].freq / spec.freq
+                div   = min(CLKDIV_RATIOS, key=lambda r: abs(r - ratio))
+                self.specials += Instance("CLKDIV",
+                    p_DIV_MODE = str(div),
+                    i_HCLKIN   = getattr(self, f"cd_{parent}").clk,
+                    i_RESETN   = 1,
+                    i_CALIB    = 0,
+                    o_CLKOUT   = cd.clk,
+                )
+                self.specials += AsyncResetSynchronizer(cd, getattr(self, f"cd_{parent}").rst)
+                derived[name] = (parent, div)
+                continue
+
+            # Add an output to an existing multi-output PLL, else use a new PLL.
+            for pll, names in plls:
+                if len(names) < family.nclkouts and self._solve(family, input_freq, names + [name]):
+                    break
+            else:
+                if len(plls) >= npll:
+                    raise ValueError(
+                        f"{platform.devicename}: {npll} PLL(s) available, cannot generate "
+                        f"{name} at {spec.freq / 1e6:.3f} MHz"
+                    )
+                if self._solve(family, input_freq, [name]) is None:
+                    raise ValueError(
+                        f"{family.name} PLL cannot generate {name} at "
+                        f"{spec.freq / 1e6:.3f} MHz from {input_freq / 1e6:.3f} MHz"
+                    )
+                pll = self._create_pll(platform, family, clk_in, reset_btn, input_freq,
+                                       name="pll" if not plls else f"pll{len(plls)}")
+                names = []
+                plls.append((pll, names))
+
+            pll.create_clkout(cd, spec.freq, phase=spec.phase, margin=spec.margin)
+            names.append(name)
+            generated[name] = spec
+
+        # Report what the PLL wrappers will actually configure (their own
+        # divider choice), and derive the CLKDIV outputs from it.
+        for pll, names in plls:
+            solution = solution_from_config(family, input_freq, pll.compute_config(),
+                [generated[name].freq for name in names],
+                [generated[name].phase for name in names])
+            self.report.append(solution.report(names))
+            self.achieved.update(zip(names, solution.achieved))
+        for name, (parent, div) in derived.items():
+            spec     = self.clocks[name]
+            achieved = self.achieved[parent] / div
+            error    = abs(achieved - spec.freq) / spec.freq
+            self.report.append(
+                f"CLKDIV: {name} = {parent} / {div}, requested {spec.freq / 1e6:.4f} MHz, "
+                f"achieved {achieved / 1e6:.4f} MHz, error {error * 1e6:.1f} ppm"
             )
+            if error > spec.margin:
+                raise ValueError(
+                    f"CLKDIV cannot generate {name} at {spec.freq / 1e6:.3f} MHz "
+                    f"from {parent} at {self.achieved[parent] / 1e6:.3f} MHz"
+                )
+            self.achieved[name] = achieved
 
-            # Reset is active-low on button
-            self.comb += self.pll.reset.eq(~reset_btn)
+    def _solve(self, family, input_freq, names):
+        """Search a PLL setting for the given domains; None if out of margin."""
+        specs    = [self.clocks[name] for name in names]
+        solution = search_pll(family, input_freq, [spec.freq for spec in specs],
+                              [spec.phase for spec in specs])
+        if solution is None:
+            return None
+        if any(err > spec.margin for err, spec in zip(solution.errors, specs)):
+            return None
+        return solution
 
-            # Register input clock
-            self.pll.register_clkin(clk_in, input_freq)
+    def _find_clkdiv_parent(self, spec, generated):
+        """
+        Return the name of a PLL output that CLKDIV can divide down to spec.
 
-            # Create output clock
-            self.pll.create_clkout(self.cd_sys, output_freq)
+        Only phase-0 PLL outputs qualify: a phase-shifted parent would lose
+        its offset against the divided clock, and CLKDIVs cannot be chained.
+        """
+        if spec.phase != 0:
+            return None
+        for name, parent in generated.items():
+            if parent.phase != 0:
+                continue
+            for ratio in CLKDIV_RATIOS:
+                if abs(parent.freq / ratio - spec.freq) / spec.freq <= spec.margin:
+                    return name
+        return None
+
+    def _create_pll(self, platform, family, clk_in, reset_btn, input_freq, name):
+        """Instantiate the vendor PLL for the given family as self.<name>."""
+        if family.name == "GW5A":
+            pll = GW5APLL(devicename=platform.devicename, device=platform.device)
+        elif family.name == "GW2A":
+            # Same rPLL primitive as GW1N, with GW2A VCO/PFD limits.
+            pll = GW2APLL(devicename=platform.devicename, device=platform.device)
         else:
-            # GW5A and others: no supported PLL yet -> simple pass-through.
-            # Assumes input_freq == output_freq (enforced by your config).
-            self.comb += self.cd_sys.clk.eq(clk_in)
-            self.comb += self.cd_sys.rst.eq(~reset_btn)
+            pll = GW1NPLL(devicename=platform.devicename, device=platform.device)
+        setattr(self, name, pll)
+
+        # Reset is active-low on button
+        self.comb += pll.reset.eq(~reset_btn | self.rst)
+
+        # Register input clock
+        pll.register_clkin(clk_in, input_freq)
+        return pll
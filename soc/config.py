@@ -1,7 +1,21 @@
 """SoC Configuration"""
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass
+class ClockSpec:
+    """
+    Requested clock domain.
+
+    freq is in Hz, phase in degrees relative to the PLL reference and margin
+    is the accepted relative frequency error.
+    """
+
+    freq: float
+    phase: float = 0.0
+    margin: float = 1e-2
 
 @dataclass
 class SoCConfig:
@@ -17,6 +31,9 @@ class SoCConfig:
     
     # Clock configuration
     sys_clk_freq: float = 27e6
+    # Additional clock domains besides sys, e.g.
+    # {"mem": ClockSpec(54e6), "video": ClockSpec(25.2e6)}
+    clocks: Dict[str, ClockSpec] = field(default_factory=dict)
     
     # Memory configuration
     # When true, the board is allowed to add external main RAM
@@ -25,6 +42,37 @@ class SoCConfig:
     integrated_rom_size: int = 128 * 1024  # 128 KiB
     integrated_sram_size: int = 8 * 1024  # 8 KiB
     external_ram_size: int = 4 * 1024 * 1024  # 4 MiB (board interprets this)
+    # External RAM front end: cycles a port may wait before it overrides
+    # port priorities (0: strict priority).
+    external_ram_max_wait: int = 1024
+    # Hardware self-test of external RAM (PRBS fill and verify), run by the
+    # BIOS before booting (takes seconds on HyperRAM); results in CSRs.
+    with_bist: bool = False
+    # Single-cycle on-chip RAM for hot code/data ("fast_ram" linker region).
+    # None: size from the BSRAM left over, 0: disabled.
+    fast_ram_size: Optional[int] = None
+    
+    # DMA configuration
+    # memcpy/memset/descriptor-chain engine as a second bus master.
+    with_dma: bool = False
+    dma_burst_length: int = 8
+    
+    # Cycle timer configuration
+    # Free-running 64-bit cycle counter read with plain loads, with compare
+    # channels sharing one interrupt.
+    with_cycle_timer: bool = False
+    cycle_timer_channels: int = 4
+    
+    # Profiler configuration
+    # PC-sampling profiler; samples stream out on profiler_uart_name pads
+    # ("" keeps them in the ring buffer for CSR/bridge readout). Source "irq":
+    # the firmware ISR in firmware/profiler records mepc; "ibus": hardware tap
+    # of the instruction fetch address (cores without instruction cache).
+    with_profiler: bool = False
+    profiler_source: str = "irq"
+    profiler_uart_name: str = ""
+    profiler_baudrate: int = 1_000_000
+    profiler_sample_rate: int = 1000
     
     # Kernel configuration
     # When external RAM is disabled, kernel address is set to SRAM
@@ -34,6 +82,29 @@ class SoCConfig:
     cpu_type: str = "vexriscv"
     cpu_variant: str = "standard"
     cpu_reset_address: Optional[int] = None
+    # vexriscv_smp only: harts and per-hart L1 cache sizes in bytes
+    # (pick a combination pre-generated in pythondata-cpu-vexriscv_smp).
+    cpu_count: int = 1
+    cpu_icache_size: int = 4096
+    cpu_dcache_size: int = 4096
+    
+    # UART configuration
+    # Console (BIOS) UART pads, baud rate and FIFO depth.
+    uart_name: str = "serial"
+    uart_baudrate: int = 115200
+    uart_fifo_depth: int = 16
+    # Secondary UART ("uart1"); with DMA it streams to/from memory through
+    # its own, deeper FIFOs (covering DMA turnaround at Mbaud rates).
+    uart1_pads: str = "uart0"
+    uart1_baudrate: int = 115200
+    uart1_fifo_depth: int = 16
+    uart1_with_dma: bool = False
+    uart1_dma_fifo_depth: int = 512
+    # UART-to-Wishbone bridge pads ("" disabled). Using the console's pads
+    # ("serial") shares them: the console then becomes a crossover UART and
+    # the bridge runs at uart_baudrate. None: 1 Mbaud on its own pads.
+    uartbone_name: str = ""
+    uartbone_baudrate: Optional[int] = None
     
     # Peripheral configuration (desire; board decides what it can provide)
     want_uart: bool = True
@@ -42,6 +113,18 @@ class SoCConfig:
     want_i2c: bool = True
     want_spi: bool = True
     want_pwm: bool = True
+    want_video: bool = False
+    
+    # Video configuration
+    # Framebuffer is (hres / video_scale) x (vres / video_scale) pixels at the
+    # top of main RAM; see cores/video for the formats.
+    video_timings: str = "640x480@60Hz"
+    video_scale: int = 4
+    video_format: str = "rgb332"
+    
+    # Simulation configuration (sim board)
+    # Image preloaded into main RAM and booted by the BIOS.
+    sim_ram_init: str = ""
     
     # Build configuration
     build_name: str = "soc"
@@ -49,11 +132,48 @@ class SoCConfig:
     
     def __post_init__(self):
         """Adjust configuration based on memory settings"""
+        if self.want_uart and self.uart1_pads == self.uart_name:
+            raise ValueError(f"uart1 and the console cannot share pads '{self.uart_name}'")
+        if self.uartbone_name:
+            if self.want_uart and self.uartbone_name == self.uart1_pads:
+                raise ValueError(f"uartbone and uart1 cannot share pads '{self.uart1_pads}'")
+            if self.uartbone_name == self.uart_name != "serial":
+                raise ValueError("uartbone can only share the console on 'serial' pads")
+            if (self.uartbone_name == self.uart_name and
+                self.uartbone_baudrate not in (None, self.uart_baudrate)):
+                raise ValueError(
+                    f"uartbone sharing the console runs at the console's {self.uart_baudrate} "
+                    f"baud, not {self.uartbone_baudrate}; set the rate with uart_baudrate"
+                )
+        if self.cpu_count > 1 and self.cpu_type != "vexriscv_smp":
+            raise ValueError("cpu_count > 1 needs cpu_type 'vexriscv_smp'")
+        if self.sim_ram_init and self.with_bist:
+            raise ValueError("the memory BIST would overwrite sim_ram_init")
+        if self.with_profiler and self.profiler_source not in ("irq", "ibus"):
+            raise ValueError(f"unknown profiler_source '{self.profiler_source}'")
+        if (self.with_profiler and self.profiler_source == "ibus" and
+            (self.cpu_type, self.cpu_variant.split("+")[0]) != ("vexriscv", "minimal")):
+            raise ValueError(
+                f"profiler_source 'ibus' needs a core without instruction cache (vexriscv "
+                f"'minimal'); {self.cpu_type} '{self.cpu_variant}' does not expose its PC, "
+                f"use profiler_source 'irq'"
+            )
+        if self.with_profiler and self.profiler_uart_name:
+            used = {self.uart_name, self.uartbone_name} | ({self.uart1_pads} if self.want_uart else set())
+            if self.profiler_uart_name in used:
+                raise ValueError(f"profiler pads '{self.profiler_uart_name}' are already in use")
         if not self.with_external_ram and self.kernel_address is None:
             # Set kernel address to SRAM when no external RAM
             # LiteX typically places SRAM at 0x10000000 for VexRiscv
             self.kernel_address = 0x10000000
     
+    @property
+    def bridge_baudrate(self):
+        """Line rate of the UART-to-Wishbone bridge."""
+        if self.uartbone_name == self.uart_name:
+            return self.uart_baudrate
+        return self.uartbone_baudrate or 1_000_000
+
     @property
     def output_path(self):
         """Get full output path"""
@@ -0,0 +1,189 @@
+"""
+Differential Flashing
+
+Writes only the flash regions (and sectors) that differ from the board's
+flash, and verifies flash contents without writing.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+# Readback comparison granularity; openFPGALoader erases in up to 64 KiB
+# blocks, so runs are kept aligned to this.
+SECTOR_SIZE = 0x10000
+
+
+@dataclass
+class FlashRegion:
+    """A file written at offset of the FPGA's internal or external flash."""
+
+    name: str
+    offset: int
+    path: str
+    external: bool = False
+
+    def read(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+
+class FlashManifest:
+    """
+    Hashes of the data last written per region, stored as JSON.
+
+    This records what this host wrote, not what the board holds: another
+    board, or one flashed from elsewhere, does not match it.
+    """
+
+    def __init__(self, path):
+        self.path    = path
+        self.regions: Dict[str, dict] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.regions = json.load(f).get("regions", {})
+
+    def matches(self, region: FlashRegion, digest) -> bool:
+        entry = self.regions.get(region.name)
+        return entry is not None and entry == self._entry(region, digest)
+
+    def record(self, region: FlashRegion, digest):
+        self.regions[region.name] = self._entry(region, digest)
+        self.save()
+
+    def forget(self, region: FlashRegion):
+        """Drop a region whose flash contents are unknown (failed write)."""
+        if self.regions.pop(region.name, None) is not None:
+            self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump({"regions": self.regions}, f, indent=2, sort_keys=True)
+
+    @staticmethod
+    def _entry(region, digest):
+        return {"offset": region.offset, "external": region.external, "sha256": digest}
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _differing_runs(old: bytes, new: bytes, sector_size) -> List[Tuple[int, int]]:
+    """(offset, length) runs of sectors where new differs from old."""
+    runs = []
+    for offset in range(0, len(new), sector_size):
+        end = min(offset + sector_size, len(new))
+        if old[offset:end] == new[offset:end]:
+            continue
+        if runs and runs[-1][0] + runs[-1][1] == offset:
+            runs[-1] = (runs[-1][0], end - runs[-1][0])
+        else:
+            runs.append((offset, end - offset))
+    return runs
+
+
+class DifferentialFlasher:
+    """
+    Flash regions through a LiteX OpenFPGALoader programmer.
+
+    With readback, external-flash regions are read back and only the
+    differing sectors are written; internal flash cannot be read back, so
+    its regions are written in full. Without readback, regions whose hash
+    matches the manifest are skipped, which is only safe while the board
+    in hand is the one this host last flashed.
+    """
+
+    def __init__(self, prog, manifest_path, readback=False, force=False, sector_size=SECTOR_SIZE):
+        """
+        Initialize flasher.
+
+        Args:
+            prog: LiteX OpenFPGALoader programmer.
+            manifest_path: Flash manifest JSON file.
+            readback: Compare external regions against the flash contents
+                and write internal regions unconditionally.
+            force: Write every region in full.
+            sector_size: Readback comparison granularity in bytes.
+        """
+        self.prog        = prog
+        self.manifest    = FlashManifest(manifest_path)
+        self.readback    = readback
+        self.force       = force
+        self.sector_size = sector_size
+
+    def flash(self, regions: List[FlashRegion]):
+        """Write the regions that changed."""
+        for region in regions:
+            data   = region.read()
+            digest = _digest(data)
+            where  = f"{region.name} @ 0x{region.offset:06x}"
+
+            if not self.force and self.readback and region.external:
+                runs = _differing_runs(self.dump(region, len(data)), data, self.sector_size)
+                if not runs:
+                    print(f"  {where}: unchanged (readback)")
+                else:
+                    changed = sum(length for _, length in runs)
+                    print(f"  {where}: writing {changed} of {len(data)} bytes in {len(runs)} run(s)")
+                    self.manifest.forget(region)
+                    for offset, length in runs:
+                        self._write(region, data[offset:offset + length], offset)
+            elif not self.force and not self.readback and self.manifest.matches(region, digest):
+                print(f"  {where}: unchanged (manifest)")
+            else:
+                print(f"  {where}: writing {len(data)} bytes")
+                self.manifest.forget(region)
+                self._write(region, data, 0)
+            self.manifest.record(region, digest)
+
+    def verify(self, regions: List[FlashRegion]) -> Tuple[bool, List[str]]:
+        """
+        Compare flash against the region files without writing.
+
+        Returns whether no region mismatched and the names of the regions
+        that could not be checked (internal flash cannot be read back).
+        """
+        ok         = True
+        unverified = []
+        for region in regions:
+            data  = region.read()
+            where = f"{region.name} @ 0x{region.offset:06x}"
+            if region.external:
+                runs = _differing_runs(self.dump(region, len(data)), data, self.sector_size)
+                if runs:
+                    ok = False
+                    print(f"  {where}: MISMATCH in " + ", ".join(
+                        f"0x{region.offset + offset:06x}+0x{length:x}" for offset, length in runs))
+                else:
+                    print(f"  {where}: OK (readback)")
+            else:
+                unverified.append(region.name)
+                print(f"  {where}: UNVERIFIED (internal flash cannot be read back)")
+        return ok, unverified
+
+    def dump(self, region: FlashRegion, size) -> bytes:
+        """Read size bytes of a region from flash."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, f"{region.name}.bin")
+            cmd  = self.prog.cmd + ["--dump-flash", "--offset", str(region.offset),
+                                    "--file-size", str(size)]
+            if region.external:
+                cmd.append("--external-flash")
+            self.prog.call(cmd + [path])
+            with open(path, "rb") as f:
+                return f.read()
+
+    def _write(self, region, data, offset):
+        if offset == 0 and len(data) == os.path.getsize(region.path):
+            self.prog.flash(region.offset, region.path, external=region.external)
+            return
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, f"{region.name}_{offset:x}.bin")
+            with open(path, "wb") as f:
+                f.write(data)
+            self.prog.flash(region.offset + offset, path, external=region.external)
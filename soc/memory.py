@@ -0,0 +1,204 @@
+"""Main RAM and On-chip Fast RAM"""
+
+import os
+
+from litex.soc.integration.soc import SoCRegion
+
+from cores.bist import MemoryBIST
+from cores.bist.memtest import PATTERN_PRBS
+from cores.hyperbus import HyperRAMFrontend
+from .resources import estimate_resources
+
+# BSRAM blocks kept free as a margin for the resource estimate.
+_ESTIMATE_MARGIN_BLOCKS = 1
+
+# Smallest region worth adding.
+_FAST_RAM_MIN_SIZE = 1024
+
+# BIOS library running the main RAM BIST at boot (see add_bist_software).
+_BIST_BIOS_LIBRARY = os.path.join(os.path.dirname(__file__), "..", "firmware", "libbist")
+
+
+def add_main_ram(soc, config, bus, reserved=0):
+    """
+    Map a memory controller as main_ram behind the multi-port front end.
+
+    The SoC bus is the front end's "soc" port; peripherals can take their
+    own port from soc.hyperram_frontend. With config.with_bist the memory
+    gets a BIST on its own port, run by the BIOS (add_bist_software).
+
+    The top reserved bytes (rounded up to 4 KiB) stay decoded but are left
+    out of the main_ram region, so the linker, heap/stack and the BIST do
+    not touch them (e.g. a framebuffer at main_ram origin + size).
+    """
+    soc.hyperram_frontend = HyperRAMFrontend(bus, max_wait=config.external_ram_max_wait)
+
+    origin = soc.mem_map["main_ram"]
+    size   = config.external_ram_size - (-(-reserved // 0x1000) * 0x1000)
+    soc.bus.add_slave(
+        name="main_ram",
+        slave=soc.hyperram_frontend.get_port("soc"),
+        region=SoCRegion(origin=origin, size=size),
+    )
+
+    if config.with_bist:
+        soc.main_ram_bist = MemoryBIST(
+            base=origin,
+            size=size,
+            pattern=PATTERN_PRBS,
+        )
+        port = soc.hyperram_frontend.get_port("bist")
+        soc.comb += soc.main_ram_bist.bus.connect(port)
+
+    # Skip the (much slower) BIOS software memory test
+    soc.add_constant("CONFIG_MAIN_RAM_INIT")
+
+
+def fast_ram_budget(soc, board):
+    """
+    Return the BSRAM bytes left by everything instantiated in soc so far.
+
+    Uses the resource estimate (ROM at its size after shrinking to the BIOS,
+    SRAM, CPU caches and each peripheral's FIFOs and buffers). May be
+    negative if the configuration already exceeds the board's BSRAM.
+    """
+    used = estimate_resources(soc, board).total.bsram + _ESTIMATE_MARGIN_BLOCKS
+    return (board.bsram_blocks - used) * board.bsram_block_size
+
+
+def fast_ram_auto_size(soc, board):
+    """Largest power-of-two region that fits the BSRAM budget, or 0."""
+    budget = fast_ram_budget(soc, board)
+    if budget < _FAST_RAM_MIN_SIZE:
+        return 0
+    return 1 << (budget.bit_length() - 1)
+
+
+def add_fast_ram(soc, board, config):
+    """
+    Add the fast_ram region (single-cycle on-chip SRAM) to the SoC.
+
+    config.fast_ram_size selects the size; None sizes it automatically from
+    the BSRAM left over and 0 disables it. Add it after all peripherals so
+    their BSRAM is accounted for.
+    """
+    size = config.fast_ram_size
+    if size is None:
+        size = fast_ram_auto_size(soc, board)
+        if not size:
+            print(
+                f"Fast RAM: no BSRAM left on {board.name} "
+                f"(budget {fast_ram_budget(soc, board)} bytes), region not added"
+            )
+            return
+    if not size:
+        return
+
+    soc.add_ram("fast_ram", origin=soc.mem_map["fast_ram"], size=size)
+    print(f"Fast RAM: {size // 1024} KiB at 0x{soc.mem_map['fast_ram']:08x}")
+
+
+def add_bist_software(soc, builder):
+    """
+    Link the main RAM BIST runner into the BIOS.
+
+    The BIOS links every software library whole, so the runner's BIOS init
+    function starts the test before the boot sequence and prints the
+    result. Does nothing without soc.main_ram_bist.
+    """
+    if not hasattr(soc, "main_ram_bist"):
+        return
+    # The builder appends the BIOS package last, after this library.
+    builder.add_software_package("libbist", os.path.abspath(_BIST_BIOS_LIBRARY))
+    builder.add_software_library("libbist")
+
+
+# Linker/header templates ----------------------------------------------------
+
+_FAST_RAM_LD = """\
+/* Generated: fast_ram sections. INCLUDE after the main SECTIONS block. */
+SECTIONS
+{{
+	.fast_text : ALIGN(4)
+	{{
+		_ffast_text = .;
+		*(.fast_text .fast_text.*)
+		. = ALIGN(4);
+		_efast_text = .;
+	}} > fast_ram AT > {load_region}
+	_fast_text_loadaddr = LOADADDR(.fast_text);
+
+	.fast_data : ALIGN(4)
+	{{
+		_ffast_data = .;
+		*(.fast_data .fast_data.*)
+		. = ALIGN(4);
+		_efast_data = .;
+	}} > fast_ram AT > {load_region}
+	_fast_data_loadaddr = LOADADDR(.fast_data);
+
+	.fast_bss (NOLOAD) : ALIGN(4)
+	{{
+		_ffast_bss = .;
+		*(.fast_bss .fast_bss.*)
+		. = ALIGN(4);
+		_efast_bss = .;
+	}} > fast_ram
+}}
+
+PROVIDE(_fstack_fast = ORIGIN(fast_ram) + LENGTH(fast_ram));
+"""
+
+_FAST_RAM_H = """\
+#ifndef __GENERATED_FAST_RAM_H
+#define __GENERATED_FAST_RAM_H
+
+/* Generated: placement helpers for the fast_ram region (fast_ram.ld). */
+
+#define __fast_text __attribute__((section(".fast_text"), noinline))
+#define __fast_data __attribute__((section(".fast_data")))
+#define __fast_bss  __attribute__((section(".fast_bss")))
+
+extern unsigned int _ffast_text[], _efast_text[], _fast_text_loadaddr[];
+extern unsigned int _ffast_data[], _efast_data[], _fast_data_loadaddr[];
+extern unsigned int _ffast_bss[], _efast_bss[];
+extern unsigned int _fstack_fast[];
+
+/* Copy .fast_text/.fast_data to fast_ram and clear .fast_bss; call early in main(). */
+static inline void fast_ram_init(void)
+{
+	unsigned int *src, *dst;
+
+	for (src = _fast_text_loadaddr, dst = _ffast_text; dst < _efast_text;)
+		*dst++ = *src++;
+	for (src = _fast_data_loadaddr, dst = _ffast_data; dst < _efast_data;)
+		*dst++ = *src++;
+	for (dst = _ffast_bss; dst < _efast_bss;)
+		*dst++ = 0;
+	/* Fetches of .fast_text must see the copied code. */
+	__asm__ volatile("fence.i" ::: "memory");
+}
+
+#endif
+"""
+
+
+def write_fast_ram_files(soc, generated_dir):
+    """
+    Write fast_ram.ld and fast_ram.h next to the LiteX generated headers.
+
+    Without a fast_ram region, files left by an earlier build are removed so
+    firmware using them fails to build instead of targeting a missing region.
+    """
+    if "fast_ram" not in soc.bus.regions:
+        for filename in ("fast_ram.ld", "fast_ram.h"):
+            path = os.path.join(generated_dir, filename)
+            if os.path.exists(path):
+                os.remove(path)
+        return
+    load_region = "main_ram" if "main_ram" in soc.bus.regions else "sram"
+    os.makedirs(generated_dir, exist_ok=True)
+    with open(os.path.join(generated_dir, "fast_ram.ld"), "w") as f:
+        f.write(_FAST_RAM_LD.format(load_region=load_region))
+    with open(os.path.join(generated_dir, "fast_ram.h"), "w") as f:
+        f.write(_FAST_RAM_H)
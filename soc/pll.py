@@ -0,0 +1,306 @@
+"""Gowin PLL Parameter Search"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class PLLFamily:
+    """
+    Electrical limits of a Gowin PLL family.
+
+    Two topologies exist:
+      - "rpll": GW1N/GW2A rPLL. CLKOUT = PFD * FBDIV and VCO = CLKOUT * ODIV;
+        CLKOUTP is CLKOUT with the PLL's one phase offset, CLKOUTD is
+        CLKOUT(P) / an even divider (2-128) and CLKOUTD3 is CLKOUT(P) / 3
+        (see rpll_outputs).
+      - "pll":  GW5A PLL, up to seven outputs. VCO = PFD * FBDIV * MDIV and
+        CLKOUTn = VCO / ODIVn.
+    """
+
+    name: str
+    topology: str
+    pfd_freq_range: Tuple[float, float]
+    vco_freq_range: Tuple[float, float]
+    clkout_freq_range: Tuple[float, float]
+    idiv_range: range
+    fbdiv_range: range
+    odiv_values: Tuple[int, ...]
+    mdiv_range: range = range(1, 2)
+    nclkouts: int = 1
+
+
+# Limits follow the LiteX PLL wrappers, which choose the dividers that are
+# actually instantiated; search_pll only has to agree on feasibility.
+GW1N_PLL = PLLFamily(
+    name="GW1N",
+    topology="rpll",
+    pfd_freq_range=(3e6, 400e6),
+    vco_freq_range=(400e6, 900e6),
+    clkout_freq_range=(3.125e6, 600e6),
+    idiv_range=range(1, 64),
+    fbdiv_range=range(1, 64),
+    odiv_values=(2, 4, 8, 16, 32, 48, 64, 80, 96, 112, 128),
+    nclkouts=4,
+)
+
+GW2A_PLL = PLLFamily(
+    name="GW2A",
+    topology="rpll",
+    pfd_freq_range=(3e6, 500e6),
+    vco_freq_range=(500e6, 1250e6),
+    clkout_freq_range=(3.90625e6, 625e6),
+    idiv_range=range(1, 64),
+    fbdiv_range=range(1, 64),
+    odiv_values=(2, 4, 8, 16, 32, 48, 64, 80, 96, 112, 128),
+    nclkouts=4,
+)
+
+GW5A_PLL = PLLFamily(
+    name="GW5A",
+    topology="pll",
+    pfd_freq_range=(19e6, 400e6),
+    vco_freq_range=(800e6, 1600e6),
+    clkout_freq_range=(6.25e6, 1600e6),
+    idiv_range=range(1, 64),
+    fbdiv_range=range(1, 2),
+    odiv_values=tuple(range(1, 129)),
+    mdiv_range=range(2, 128),
+    nclkouts=7,
+)
+
+# Device prefix -> (PLL family, number of PLLs on the die).
+# Longest matching prefix wins; unknown parts are assumed to have one PLL.
+_DEVICES: Dict[str, Tuple[PLLFamily, int]] = {
+    "GW1N":      (GW1N_PLL, 1),
+    "GW1N-4":    (GW1N_PLL, 2),
+    "GW1N-9":    (GW1N_PLL, 2),
+    "GW1NR-9":   (GW1N_PLL, 2),
+    "GW2A":      (GW2A_PLL, 1),
+    "GW2A-18":   (GW2A_PLL, 4),
+    "GW2AR-18":  (GW2A_PLL, 4),
+    "GW5A":      (GW5A_PLL, 1),
+}
+
+
+def get_pll_family(device: str) -> Tuple[Optional[PLLFamily], int]:
+    """
+    Look up the PLL family and PLL count for a Gowin device string.
+
+    Returns:
+        (family, count), or (None, 0) if the device has no supported PLL.
+    """
+    matches = [prefix for prefix in _DEVICES if device.startswith(prefix)]
+    if not matches:
+        return None, 0
+    return _DEVICES[max(matches, key=len)]
+
+
+@dataclass
+class PLLSolution:
+    """Best PLL configuration found for a set of requested outputs."""
+
+    family: PLLFamily
+    clkin_freq: float
+    params: Dict[str, object]
+    vco_freq: float
+    requested: List[float] = field(default_factory=list)
+    achieved: List[float] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+
+    @property
+    def errors(self) -> List[float]:
+        """Relative frequency error of each output."""
+        return [abs(a - r) / r for r, a in zip(self.requested, self.achieved)]
+
+    @property
+    def max_error(self) -> float:
+        return max(self.errors)
+
+    def report(self, names=None) -> str:
+        """Human readable summary of the configuration."""
+        names   = names or [f"clkout{n}" for n in range(len(self.requested))]
+        outputs = self.outputs or [f"CLKOUT{n}" for n in range(len(self.requested))]
+        params  = ", ".join(f"{k}={v}" for k, v in self.params.items())
+        lines = [f"{self.family.name} PLL: {params}, VCO {self.vco_freq / 1e6:.3f} MHz"]
+        for name, output, req, ach, err in zip(names, outputs, self.requested, self.achieved, self.errors):
+            lines.append(
+                f"  {name:<10} {output:<9} requested {req / 1e6:9.4f} MHz, "
+                f"achieved {ach / 1e6:9.4f} MHz, error {err * 1e6:8.1f} ppm"
+            )
+        return "\n".join(lines)
+
+
+def _in_range(value, value_range):
+    return value_range[0] <= value <= value_range[1]
+
+
+def rpll_outputs(clkout_freqs, phases=None) -> Optional[List[Tuple[str, int]]]:
+    """
+    Assign requested outputs to the rPLL's CLKOUT/CLKOUTP/CLKOUTD/CLKOUTD3.
+
+    Follows the LiteX GW1NPLL wrapper: dividers are taken relative to the
+    fastest output, which comes from CLKOUT (phase 0) or CLKOUTP (the one
+    non-zero phase); slower outputs need /3 (CLKOUTD3) or one even divider
+    (CLKOUTD), each usable once. A divided output would see the offset
+    divided as well, so only full-rate outputs may be phase-shifted.
+
+    Returns:
+        [(output, divider)] in request order, or None if the set does not fit.
+    """
+    phases = list(phases) if phases is not None else [0] * len(clkout_freqs)
+    if len({phase for phase in phases if phase != 0}) > 1:
+        return None
+    fastest = max(clkout_freqs)
+    outputs = []
+    for freq, phase in zip(clkout_freqs, phases):
+        div = int(fastest // freq)
+        if div == 1:
+            output = "CLKOUT" if phase == 0 else "CLKOUTP"
+        elif phase != 0:
+            return None
+        elif div == 3:
+            output = "CLKOUTD3"
+        elif div % 2 == 0 and div <= 128:
+            output = "CLKOUTD"
+        else:
+            return None
+        if any(output == used for used, _ in outputs):
+            return None
+        outputs.append((output, div))
+    return outputs
+
+
+def _search_rpll(family, clkin_freq, clkout_freqs, phases):
+    outputs = rpll_outputs(clkout_freqs, phases)
+    if outputs is None:
+        return None
+    fastest = max(clkout_freqs)
+    best = None
+    for idiv in family.idiv_range:
+        pfd_freq = clkin_freq / idiv
+        if not _in_range(pfd_freq, family.pfd_freq_range):
+            continue
+        for fbdiv in family.fbdiv_range:
+            freq = pfd_freq * fbdiv
+            if not _in_range(freq, family.clkout_freq_range):
+                continue
+            achieved = [freq / div for _, div in outputs]
+            error    = max(abs(a - r) / r for r, a in zip(clkout_freqs, achieved))
+            for odiv in family.odiv_values:
+                vco_freq = freq * odiv
+                if not _in_range(vco_freq, family.vco_freq_range):
+                    continue
+                # Prefer the smallest error, then the highest VCO (lower jitter).
+                key = (error, -vco_freq)
+                if best is None or key < best[0]:
+                    params = {"idiv": idiv, "fbdiv": fbdiv, "odiv": odiv}
+                    best = (key, params, vco_freq, achieved)
+    return best
+
+
+def _search_pll(family, clkin_freq, clkout_freqs):
+    best = None
+    for idiv in family.idiv_range:
+        pfd_freq = clkin_freq / idiv
+        if not _in_range(pfd_freq, family.pfd_freq_range):
+            continue
+        for fbdiv in family.fbdiv_range:
+            for mdiv in family.mdiv_range:
+                vco_freq = pfd_freq * fbdiv * mdiv
+                if not _in_range(vco_freq, family.vco_freq_range):
+                    continue
+                odivs    = []
+                achieved = []
+                for clkout_freq in clkout_freqs:
+                    odiv = min(family.odiv_values, key=lambda d: abs(vco_freq / d - clkout_freq))
+                    odivs.append(odiv)
+                    achieved.append(vco_freq / odiv)
+                if not all(_in_range(f, family.clkout_freq_range) for f in achieved):
+                    continue
+                error = max(abs(a - r) / r for r, a in zip(clkout_freqs, achieved))
+                key = (error, -vco_freq)
+                if best is None or key < best[0]:
+                    params = {"idiv": idiv, "fbdiv": fbdiv, "mdiv": mdiv}
+                    params.update({f"odiv{n}": d for n, d in enumerate(odivs)})
+                    best = (key, params, vco_freq, achieved)
+    return best
+
+
+def search_pll(family: PLLFamily, clkin_freq: float, clkout_freqs, phases=None) -> Optional[PLLSolution]:
+    """
+    Exhaustively search PLL divider settings for the requested outputs.
+
+    Args:
+        family: PLL family limits.
+        clkin_freq: Reference clock frequency in Hz.
+        clkout_freqs: Requested output frequencies in Hz.
+        phases: Requested output phases in degrees (rPLL output assignment).
+
+    Returns:
+        The configuration with the lowest worst-case frequency error, or None
+        if no setting satisfies the family's PFD/VCO/output limits.
+    """
+    clkout_freqs = list(clkout_freqs)
+    if len(clkout_freqs) > family.nclkouts:
+        return None
+    outputs = []
+    if family.topology == "rpll":
+        best    = _search_rpll(family, clkin_freq, clkout_freqs, phases)
+        outputs = [output for output, _ in rpll_outputs(clkout_freqs, phases) or []]
+    else:
+        best = _search_pll(family, clkin_freq, clkout_freqs)
+    if best is None:
+        return None
+    _, params, vco_freq, achieved = best
+    return PLLSolution(
+        family=family,
+        clkin_freq=clkin_freq,
+        params=params,
+        vco_freq=vco_freq,
+        requested=clkout_freqs,
+        achieved=achieved,
+        outputs=outputs,
+    )
+
+
+def solution_from_config(family: PLLFamily, clkin_freq: float, config, clkout_freqs,
+                         phases=None) -> PLLSolution:
+    """
+    Describe the configuration a LiteX Gowin PLL wrapper picked.
+
+    The wrappers run their own divider search in compute_config(); this is
+    what ends up in the rPLL/PLL instance, so report it rather than
+    search_pll's choice.
+
+    Args:
+        family: PLL family of the wrapper.
+        clkin_freq: Reference clock frequency in Hz.
+        config: compute_config() result of the wrapper.
+        clkout_freqs: Requested output frequencies in clkout order.
+        phases: Requested output phases in degrees, in clkout order.
+    """
+    clkout_freqs = list(clkout_freqs)
+    outputs      = []
+    if family.topology == "rpll":
+        # CLKOUT = PFD * FBDIV; slower outputs come from CLKOUTD/CLKOUTD3.
+        freq     = clkin_freq * config["fdiv"] / config["idiv"]
+        fastest  = max(clkout_freqs)
+        achieved = [freq / int(fastest // f) for f in clkout_freqs]
+        outputs  = [output for output, _ in rpll_outputs(clkout_freqs, phases) or []]
+        params   = {"idiv": config["idiv"], "fbdiv": config["fdiv"], "odiv": config["odiv"]}
+        if "CLKOUTD" in outputs:
+            params["sdiv"] = config["SDIV_SEL"]
+    else:
+        achieved = [config["vco"] / config[f"odiv{n}"] for n in range(len(clkout_freqs))]
+        params   = {"idiv": config["idiv"], "fbdiv": config["fdiv"], "mdiv": config["mdiv"]}
+        params.update({f"odiv{n}": config[f"odiv{n}"] for n in range(len(clkout_freqs))})
+    return PLLSolution(
+        family=family,
+        clkin_freq=clkin_freq,
+        params=params,
+        vco_freq=config["vco"],
+        requested=clkout_freqs,
+        achieved=achieved,
+        outputs=outputs,
+    )
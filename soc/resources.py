@@ -0,0 +1,245 @@
+"""
+Pre-synthesis Resource Estimation
+
+Predicts LUT/FF/BSRAM usage of an elaborated (not yet finalized) SoC, so
+configurations that are unlikely to fit the board are flagged before the
+vendor toolchain runs. The CPU and ROM figures are rough (not calibrated
+against synthesis), so an over-budget estimate is a warning by default.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from migen import Memory
+from migen.fhdl.visit import NodeVisitor
+from migen.fhdl.tools import list_targets
+from migen.genlib.fsm import FSM, NextValue
+
+from litex.soc.interconnect.csr import _CSRBase, CSRStorage
+
+# Gowin BSRAM aspect ratios (depth, width) of one 18 Kbit block.
+_BSRAM_MODES = [
+    (16384, 1), (8192, 2), (4096, 4), (2048, 8), (1024, 16), (512, 32),
+    (2048, 9), (1024, 18), (512, 36),
+]
+
+# Memories this small (or with asynchronous read ports) map to LUT RAM.
+_LUTRAM_MAX_DEPTH = 16
+
+# Rough LUT/FF figures for CPU black boxes (their logic is not visible to
+# migen); refine against the vendor reports in build/<board>/gateware.
+_CPU_COSTS = {
+    "minimal":  (1100,  700),
+    "lite":     (1700, 1000),
+    "standard": (2400, 1400),
+    "full":     (3200, 1900),
+    "linux":    (5200, 3300),
+}
+
+# BSRAM bytes taken by the VexRiscv L1 caches (data + tags) per variant.
+_CPU_CACHE_BYTES = {
+    "minimal":  0,
+    "lite":     4 * 1024,
+    "standard": 10 * 1024,
+    "full":     10 * 1024,
+    "linux":    10 * 1024,
+}
+
+# VexRiscv SMP: per hart, plus the cluster (coherency, CLINT, PLIC).
+_SMP_HART_COST    = (3000, 2000)
+_SMP_CLUSTER_COST = (1500, 1000)
+
+# The BIOS ROM is shrunk to the BIOS image at build time; assume a typical
+# LiteX BIOS until a build has produced one.
+_BIOS_ROM_BYTES = 32 * 1024
+
+# Interconnect generated at finalize: LUTs per bus master / slave.
+_BUS_MASTER_LUTS = 40
+_BUS_SLAVE_LUTS  = 20
+
+
+@dataclass
+class Resources:
+    """LUT, FF and BSRAM block counts."""
+
+    lut: int = 0
+    ff: int = 0
+    bsram: int = 0
+
+    def __add__(self, other):
+        return Resources(self.lut + other.lut, self.ff + other.ff, self.bsram + other.bsram)
+
+
+@dataclass
+class ResourceEstimate:
+    """Estimated usage per top-level submodule and the board's budget."""
+
+    modules: Dict[str, Resources] = field(default_factory=dict)
+    budget: Resources = field(default_factory=Resources)
+
+    @property
+    def total(self) -> Resources:
+        return sum(self.modules.values(), Resources())
+
+    def over_budget(self) -> List[str]:
+        """Resources exceeding the budget (unknown budgets are skipped)."""
+        total = self.total
+        return [
+            name for name in ("lut", "ff", "bsram")
+            if getattr(self.budget, name) and getattr(total, name) > getattr(self.budget, name)
+        ]
+
+    def report(self) -> str:
+        lines = [f"{'Module':<24} {'LUT':>7} {'FF':>7} {'BSRAM':>6}"]
+        for name, r in sorted(self.modules.items(), key=lambda kv: -kv[1].lut):
+            lines.append(f"{name:<24} {r.lut:>7} {r.ff:>7} {r.bsram:>6}")
+        total = self.total
+        lines.append(f"{'Total':<24} {total.lut:>7} {total.ff:>7} {total.bsram:>6}")
+        usage = []
+        for name in ("lut", "ff", "bsram"):
+            available = getattr(self.budget, name)
+            if available:
+                usage.append(f"{name.upper()} {100 * getattr(total, name) // available}%")
+        if usage:
+            budget = self.budget
+            lines.append(
+                f"{'Available':<24} {budget.lut:>7} {budget.ff:>7} {budget.bsram:>6}"
+                f"  ({', '.join(usage)})"
+            )
+        return "\n".join(lines)
+
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _bsram_blocks(width, depth):
+    """Fewest BSRAM blocks holding a width x depth memory."""
+    return min(-(-width // w) * -(-depth // d) for d, w in _BSRAM_MODES)
+
+
+class _NextValueTargets(NodeVisitor):
+    """Collect NextValue targets in FSM actions."""
+
+    def __init__(self):
+        self.targets = set()
+
+    def visit_unknown(self, node):
+        if isinstance(node, NextValue):
+            self.targets |= list_targets(node.target)
+
+
+def _cpu_cache_bytes(config):
+    """BSRAM bytes taken by the CPU caches (all harts for vexriscv_smp)."""
+    if config.cpu_type == "vexriscv_smp":
+        return config.cpu_count * (config.cpu_icache_size + config.cpu_dcache_size)
+    return _CPU_CACHE_BYTES.get(config.cpu_variant, 0)
+
+
+def _bios_rom_bytes(config):
+    """ROM size after shrinking to the BIOS: the last build's, else typical."""
+    bios = os.path.join(config.output_path, "software", "bios", "bios.bin")
+    size = os.path.getsize(bios) if os.path.exists(bios) else _BIOS_ROM_BYTES
+    return min(size, config.integrated_rom_size)
+
+
+def _bits(signals):
+    return sum(len(s) for s in signals)
+
+
+def _memory_cost(mem, depth):
+    if depth <= _LUTRAM_MAX_DEPTH or any(p.async_read for p in mem.ports):
+        return Resources(lut=mem.width * -(-depth // _LUTRAM_MAX_DEPTH))
+    return Resources(bsram=_bsram_blocks(mem.width, depth))
+
+
+def _fsm_cost(fsm):
+    visitor = _NextValueTargets()
+    comb = set()
+    for actions in fsm.actions.values():
+        visitor.visit(actions)
+        comb |= list_targets(actions)
+    state_bits = max(len(fsm.actions) - 1, 1).bit_length()
+    ff = state_bits + _bits(visitor.targets)
+    return Resources(lut=ff + _bits(comb), ff=ff)
+
+
+def _csr_cost(module):
+    """CSRs are attributes, their registers and bank logic appear at finalize."""
+    cost = Resources()
+    for value in vars(module).values():
+        if isinstance(value, CSRStorage):
+            cost += Resources(lut=value.size, ff=value.size)
+        elif isinstance(value, _CSRBase):
+            cost += Resources(lut=value.size)
+    return cost
+
+
+def _module_cost(module, depths):
+    """Resources of module and its submodules."""
+    if isinstance(module, FSM):
+        return _fsm_cost(module)
+
+    fragment = module._fragment
+    sync = set()
+    for statements in fragment.sync.values():
+        sync |= list_targets(statements)
+    comb = list_targets(fragment.comb)
+    cost = Resources(lut=_bits(sync) + _bits(comb), ff=_bits(sync))
+    cost += _csr_cost(module)
+
+    for special in fragment.specials:
+        if isinstance(special, Memory):
+            cost += _memory_cost(special, depths.get(id(special), special.depth))
+
+    for _, submodule in module._submodules:
+        cost += _module_cost(submodule, depths)
+    return cost
+
+
+# Estimation ---------------------------------------------------------------------------------------
+
+def estimate_resources(soc, board) -> ResourceEstimate:
+    """
+    Estimate resource usage of soc before finalization.
+
+    Registers are counted from sync targets, logic from sync and comb target
+    widths, memories by BSRAM aspect ratio; the CPU and bus interconnect
+    (not yet elaborated) come from the cost tables above. Expect +-20%.
+    """
+    estimate = ResourceEstimate(
+        budget=Resources(lut=board.lut_count, ff=board.ff_count, bsram=board.bsram_blocks)
+    )
+
+    depths = {}
+    rom = getattr(soc, "rom", None)
+    if rom is not None and not getattr(soc, "integrated_rom_initialized", False):
+        depths[id(rom.mem)] = min(rom.mem.depth, -(-_bios_rom_bytes(soc.soc_config) // 4))
+
+    for name, submodule in soc._submodules:
+        if name == "cpu":
+            config = soc.soc_config
+            if config.cpu_type == "vexriscv_smp":
+                lut = _SMP_CLUSTER_COST[0] + config.cpu_count * _SMP_HART_COST[0]
+                ff  = _SMP_CLUSTER_COST[1] + config.cpu_count * _SMP_HART_COST[1]
+            else:
+                lut, ff = _CPU_COSTS.get(config.cpu_variant, _CPU_COSTS["standard"])
+            cache = -(-_cpu_cache_bytes(config) // board.bsram_block_size)
+            cost = Resources(lut=lut, ff=ff, bsram=cache)
+        else:
+            cost = _module_cost(submodule, depths)
+        name = name or type(submodule).__name__
+        estimate.modules[name] = estimate.modules.get(name, Resources()) + cost
+
+    top = _module_cost(_TopLevel(soc), depths)
+    bus = Resources(lut=_BUS_MASTER_LUTS * len(soc.bus.masters) + _BUS_SLAVE_LUTS * len(soc.bus.slaves))
+    estimate.modules["soc"] = top + bus
+    return estimate
+
+
+class _TopLevel:
+    """The SoC's own statements and CSRs, without its submodules."""
+
+    def __init__(self, soc):
+        self._fragment   = soc._fragment
+        self._submodules = []
+        self.__dict__.update({k: v for k, v in vars(soc).items() if isinstance(v, _CSRBase)})
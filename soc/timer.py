@@ -0,0 +1,102 @@
+"""Memory-mapped Cycle Timer"""
+
+import os
+
+from litex.soc.integration.soc import SoCRegion
+
+from cores.timer import CycleTimer
+from cores.timer.cycle import TIME_LO, TIME_HI, TIME_HI_LIVE, PENDING, CMP_BASE
+
+
+def add_cycle_timer(soc, config):
+    """
+    Add the 64-bit cycle timer as an uncached bus slave ("cycle_timer").
+
+    Its compare event is on IRQ "cycle_timer"; enable it once with
+    cycle_timer_ev_enable_write(1) and drive the channels through the
+    registers in cycle_timer.h.
+    """
+    soc.cycle_timer = CycleTimer(channels=config.cycle_timer_channels)
+    soc.bus.add_slave(
+        name="cycle_timer",
+        slave=soc.cycle_timer.bus,
+        region=SoCRegion(origin=soc.mem_map["cycle_timer"], size=0x100, cached=False),
+    )
+    soc.irq.add("cycle_timer", use_loc_if_exists=True)
+    soc.add_constant("CYCLE_TIMER_CHANNELS", config.cycle_timer_channels)
+
+
+# Header template ------------------------------------------------------------
+
+_CYCLE_TIMER_H = """\
+#ifndef __GENERATED_CYCLE_TIMER_H
+#define __GENERATED_CYCLE_TIMER_H
+
+/* Generated: 64-bit cycle timer access. */
+
+#include <stdint.h>
+
+#define CYCLE_TIMER_REG(offset) (*(volatile uint32_t *)(0x{base:08x}UL + (offset)))
+
+#define CYCLE_TIMER_TIME_LO      CYCLE_TIMER_REG(0x{time_lo:02x})
+#define CYCLE_TIMER_TIME_HI      CYCLE_TIMER_REG(0x{time_hi:02x})
+#define CYCLE_TIMER_TIME_HI_LIVE CYCLE_TIMER_REG(0x{time_hi_live:02x})
+#define CYCLE_TIMER_PENDING      CYCLE_TIMER_REG(0x{pending:02x})
+#define CYCLE_TIMER_CMP_LO(n)    CYCLE_TIMER_REG(0x{cmp_base:02x} + 8 * (n))
+#define CYCLE_TIMER_CMP_HI(n)    CYCLE_TIMER_REG(0x{cmp_base:02x} + 8 * (n) + 4)
+
+/* Low 32 bits: one load. */
+static inline uint32_t cycle_timer_read32(void)
+{{
+	return CYCLE_TIMER_TIME_LO;
+}}
+
+/* Full 64 bits: reading TIME_LO latches TIME_HI. */
+static inline uint64_t cycle_timer_read(void)
+{{
+	uint32_t lo = CYCLE_TIMER_TIME_LO;
+	return ((uint64_t)CYCLE_TIMER_TIME_HI << 32) | lo;
+}}
+
+/* Pend channel n once the time reaches when (without spurious matches). */
+static inline void cycle_timer_set_compare(int n, uint64_t when)
+{{
+	CYCLE_TIMER_CMP_HI(n) = 0xffffffff;
+	CYCLE_TIMER_CMP_LO(n) = (uint32_t)when;
+	CYCLE_TIMER_CMP_HI(n) = (uint32_t)(when >> 32);
+}}
+
+/* Disarm channel n (clears its pending bit). */
+static inline void cycle_timer_disable(int n)
+{{
+	CYCLE_TIMER_CMP_HI(n) = 0xffffffff;
+	CYCLE_TIMER_CMP_LO(n) = 0xffffffff;
+}}
+
+#endif
+"""
+
+
+def write_cycle_timer_header(soc, generated_dir):
+    """
+    Write cycle_timer.h next to the LiteX generated headers.
+
+    Without a cycle_timer region, a header left by an earlier build is
+    removed so firmware using it fails to build instead of targeting a
+    missing device.
+    """
+    path = os.path.join(generated_dir, "cycle_timer.h")
+    if "cycle_timer" not in soc.bus.regions:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    os.makedirs(generated_dir, exist_ok=True)
+    with open(path, "w") as f:
+        f.write(_CYCLE_TIMER_H.format(
+            base=soc.bus.regions["cycle_timer"].origin,
+            time_lo=TIME_LO,
+            time_hi=TIME_HI,
+            time_hi_live=TIME_HI_LIVE,
+            pending=PENDING,
+            cmp_base=CMP_BASE,
+        ))
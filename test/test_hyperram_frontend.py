@@ -0,0 +1,108 @@
+"""HyperRAM front end arbitration (migen simulation)."""
+
+import unittest
+
+from migen import Module, Signal, If, run_simulation
+
+from litex.soc.interconnect import wishbone
+
+from cores.hyperbus import HyperRAMFrontend
+
+# Cycles from stb to ack of the model controller.
+LATENCY = 4
+
+
+class _Controller(Module):
+    """Wishbone slave acking every access after LATENCY cycles."""
+
+    def __init__(self):
+        self.bus = wishbone.Interface(data_width=32)
+        count = Signal(max=LATENCY + 1)
+        self.sync += [
+            self.bus.ack.eq(0),
+            If(self.bus.cyc & self.bus.stb & ~self.bus.ack,
+                If(count == LATENCY - 1,
+                    count.eq(0),
+                    self.bus.ack.eq(1)
+                ).Else(
+                    count.eq(count + 1)
+                )
+            )
+        ]
+
+
+class _Master(Module):
+    """Single accesses back to back, dropping cyc for one cycle after each ack."""
+
+    def __init__(self, bus):
+        self.acks = Signal(32)
+        gap = Signal()
+        self.comb += [
+            bus.cyc.eq(~gap),
+            bus.stb.eq(~gap),
+        ]
+        self.sync += [
+            gap.eq(bus.ack),
+            If(bus.ack,
+                self.acks.eq(self.acks + 1)
+            )
+        ]
+
+
+class _DUT(Module):
+    def __init__(self, ports, max_wait=0):
+        self.submodules.controller = _Controller()
+        self.submodules.frontend = frontend = HyperRAMFrontend(self.controller.bus,
+            max_wait=max_wait, with_counters=False)
+        self.masters = []
+        for n, (priority, weight) in enumerate(ports):
+            master = _Master(frontend.get_port(f"p{n}", priority=priority, weight=weight))
+            self.submodules += master
+            self.masters.append(master)
+
+
+def _run(ports, cycles=3000, max_wait=0):
+    """Acks per master after cycles."""
+    dut    = _DUT(ports, max_wait=max_wait)
+    result = []
+
+    def generator():
+        for _ in range(cycles):
+            yield
+        for master in dut.masters:
+            result.append((yield master.acks))
+
+    run_simulation(dut, generator())
+    return result
+
+
+class TestHyperRAMFrontend(unittest.TestCase):
+    def assertRatio(self, acks, weights):
+        total = sum(acks)
+        self.assertGreater(total, 0)
+        for count, weight in zip(acks, weights):
+            self.assertAlmostEqual(count / total, weight / sum(weights), delta=0.02)
+
+    def test_round_robin(self):
+        self.assertRatio(_run([(0, 1), (0, 1)]), [1, 1])
+
+    def test_weights(self):
+        self.assertRatio(_run([(0, 1), (0, 4)]), [1, 4])
+
+    def test_three_weights(self):
+        self.assertRatio(_run([(0, 1), (0, 2), (0, 4)]), [1, 2, 4])
+
+    def test_strict_priority(self):
+        low, high = _run([(1, 1), (3, 1)])
+        self.assertEqual(low, 0)
+        self.assertGreater(high, 0)
+
+    def test_aging(self):
+        # A waiting low-priority port is served once it reaches max_wait.
+        low, high = _run([(1, 1), (3, 1)], max_wait=64)
+        self.assertGreater(low, 0)
+        self.assertGreater(high, low)
+
+
+if __name__ == "__main__":
+    unittest.main()